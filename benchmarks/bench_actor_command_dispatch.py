@@ -0,0 +1,46 @@
+"""Стоимость вызова ActorCommand: поиск актора по имени потока против contextvars.
+
+Запуск: python -m benchmarks.bench_actor_command_dispatch
+"""
+import argparse
+import timeit
+from threading import current_thread
+
+from patterns_otus_course_brailov.actors import (
+    Actor,
+    ActorCommand,
+    bind_context,
+    get_context,
+)
+
+
+class NoopActorCommand(ActorCommand):
+    def actor_action(self, actor: Actor):
+        return actor
+
+
+class ThreadNameActorCommand(NoopActorCommand):
+    """Прежний способ: имя текущего потока и поиск в глобальном словаре."""
+
+    def execute(self) -> None:
+        actor_name = current_thread().name
+        actor_ctx = get_context(actor_name)
+        if actor_ctx is None:
+            raise RuntimeError(f'No context for thread "{actor_name}".')
+        return self.actor_action(actor_ctx)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    actor = Actor(name=current_thread().name)
+    with bind_context(actor, register=True):
+        for command in (ThreadNameActorCommand(), NoopActorCommand()):
+            seconds = min(timeit.repeat(command.execute, number=args.number, repeat=5))
+            print(f'{type(command).__name__:>24}: {seconds / args.number * 1e9:.1f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
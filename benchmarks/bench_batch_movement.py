@@ -0,0 +1,42 @@
+"""Сравнение MoveCommand на каждый объект и одного шага BatchMovement.
+
+Запуск: python -m benchmarks.bench_batch_movement
+"""
+import argparse
+import timeit
+
+from patterns_otus_course_brailov.command import combine_commands
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.movement.batch import BatchMoveCommand, BatchMovement
+from patterns_otus_course_brailov.movement.commands import MoveCommand
+
+from .objects import Tank
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"objects":>8} {"MoveCommand, ms":>16} {"BatchMovement, ms":>18} {"speedup":>8}')
+    for count in args.objects:
+        per_object = combine_commands(
+            MoveCommand(Tank(Vector(i, i), Vector(1, -1)))
+            for i in range(count)
+        )
+        movement = BatchMovement()
+        for i in range(count):
+            movement.register(Vector(i, i), Vector(1, -1))
+        batch = BatchMoveCommand(movement)
+
+        per_object_time = min(timeit.repeat(per_object.execute, number=1, repeat=args.repeat))
+        batch_time = min(timeit.repeat(batch.execute, number=1, repeat=args.repeat))
+        print(
+            f'{count:>8} {per_object_time * 1e3:>16.2f} {batch_time * 1e3:>18.2f}'
+            f' {per_object_time / batch_time:>8.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
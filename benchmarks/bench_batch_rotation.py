@@ -0,0 +1,43 @@
+"""Сравнение RotateCommand на каждый объект и одного шага BatchRotation.
+
+Запуск: python -m benchmarks.bench_batch_rotation
+"""
+import argparse
+import timeit
+
+from patterns_otus_course_brailov.command import combine_commands
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.movement.batch import BatchRotateCommand, BatchRotation
+from patterns_otus_course_brailov.movement.commands import RotateCommand
+
+from .objects import Turret
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    speed = angles.from_degrees(1)
+    print(f'{"objects":>8} {"RotateCommand, ms":>18} {"BatchRotation, ms":>18} {"speedup":>8}')
+    for count in args.objects:
+        per_object = combine_commands(
+            RotateCommand(Turret(angles.Angle(i), speed))
+            for i in range(count)
+        )
+        rotation = BatchRotation()
+        for i in range(count):
+            rotation.register(angles.Angle(i), speed)
+        batch = BatchRotateCommand(rotation)
+
+        per_object_time = min(timeit.repeat(per_object.execute, number=1, repeat=args.repeat))
+        batch_time = min(timeit.repeat(batch.execute, number=1, repeat=args.repeat))
+        print(
+            f'{count:>8} {per_object_time * 1e3:>18.2f} {batch_time * 1e3:>18.2f}'
+            f' {per_object_time / batch_time:>8.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
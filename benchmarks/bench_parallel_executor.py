@@ -0,0 +1,81 @@
+"""Сравнение ParallelExecutor с последовательным исполнением команд в Actor.
+
+Два вида нагрузки: MoveCommand (чистый питон, держит GIL) и хеширование
+буфера (hashlib отпускает GIL на больших буферах).
+
+Запуск: python -m benchmarks.bench_parallel_executor
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+import typing
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import Command, CommandByFuntion, MacroCommand
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.movement.commands import MoveCommand
+from patterns_otus_course_brailov.parallel import KeyedCommand, ParallelBatchCommand, ParallelExecutor
+from patterns_otus_course_brailov.world import WorldState
+
+
+class HashCommand(Command):
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def execute(self) -> bytes:
+        return hashlib.sha256(self.data).digest()
+
+
+def move_commands(entities: int, steps: int) -> list[Command]:
+    world = WorldState()
+    views = [world.view(world.add(Vector(i, i), Vector(1, -1))) for i in range(entities)]
+    # по макрокоманде на объект: шаги одного объекта должны идти по порядку
+    return [MacroCommand([MoveCommand(view)] * steps) for view in views]
+
+
+def hash_commands(count: int, size: int) -> list[Command]:
+    data = os.urandom(size)
+    return [KeyedCommand(HashCommand(data), writes=[i]) for i in range(count)]
+
+
+def run_on_actor(command: Command) -> float:
+    actor = Actor(name='bench')
+    done = threading.Event()
+    actor.start()
+    started_at = time.perf_counter()
+    actor.add_commands([command, CommandByFuntion(done.set)])
+    done.wait()
+    elapsed = time.perf_counter() - started_at
+    actor.hard_stop()
+    actor.join()
+    return elapsed
+
+
+def compare(name: str, commands: list[Command], workers: typing.Sequence[int]) -> None:
+    serial = run_on_actor(MacroCommand(commands))
+    print(f'{name:<8} {"serial":>8} {serial:>10.4f}s')
+    for count in workers:
+        with ParallelExecutor(workers=count) as executor:
+            elapsed = run_on_actor(ParallelBatchCommand(executor, commands))
+        print(f'{name:<8} {count:>8} {elapsed:>10.4f}s {serial / elapsed:>8.2f}x')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entities', type=int, default=10_000)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--hashes', type=int, default=256)
+    parser.add_argument('--hash-size', type=int, default=1 << 20)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    workers = [1 << power for power in range(args.max_workers.bit_length()) if 1 << power <= args.max_workers]
+    print(f'{"load":<8} {"workers":>8} {"time":>11} {"speedup":>8}')
+    compare('move', move_commands(args.entities, args.steps), workers)
+    compare('sha256', hash_commands(args.hashes, args.hash_size), workers)
+
+
+if __name__ == '__main__':
+    main()
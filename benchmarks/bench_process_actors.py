@@ -0,0 +1,91 @@
+"""Сравнение пропускной способности Actor и ProcessActor на CPU-bound командах.
+
+Запуск: python -m benchmarks.bench_process_actors
+"""
+import argparse
+import os
+import time
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import Command
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.movement.commands import MoveCommand
+from patterns_otus_course_brailov.process_actors import ProcessActor
+
+from .objects import Tank
+
+
+class PhysicsCommand(Command):
+    """Двигает `tanks` танков `steps` раз - чисто питоновская нагрузка на процессор."""
+
+    def __init__(self, tanks: int, steps: int):
+        self.tanks = tanks
+        self.steps = steps
+
+    def execute(self) -> float:
+        commands = [
+            MoveCommand(Tank(Vector(i, i), Vector(1, -1)))
+            for i in range(self.tanks)
+        ]
+        for _ in range(self.steps):
+            for command in commands:
+                command.execute()
+        return commands[-1].movable.get_position().x
+
+
+def run_threaded(actors_count: int, commands_count: int, command: Command) -> float:
+    actors = [Actor(name=f'bench-{i}') for i in range(actors_count)]
+    started_at = time.perf_counter()
+    for actor in actors:
+        actor.start()
+    for i in range(commands_count):
+        actors[i % actors_count].add_command(command)
+    for actor in actors:
+        actor.soft_stop()
+    for actor in actors:
+        actor.join()
+    return time.perf_counter() - started_at
+
+
+def run_processes(actors_count: int, commands_count: int, command: Command) -> float:
+    actors = [ProcessActor(name=f'bench-{i}') for i in range(actors_count)]
+    for actor in actors:
+        actor.start()
+    # прогрев: процессы стартуют лениво
+    for actor in actors:
+        actor.add_command(PhysicsCommand(1, 1)).result()
+
+    started_at = time.perf_counter()
+    futures = [
+        actors[i % actors_count].add_command(command)
+        for i in range(commands_count)
+    ]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - started_at
+
+    for actor in actors:
+        actor.soft_stop()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commands', type=int, default=64)
+    parser.add_argument('--tanks', type=int, default=1000)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--max-actors', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    command = PhysicsCommand(args.tanks, args.steps)
+    print(f'{"actors":>6} {"threads, cmd/s":>16} {"processes, cmd/s":>18}')
+    actors_count = 1
+    while actors_count <= args.max_actors:
+        threaded = run_threaded(actors_count, args.commands, command)
+        processes = run_processes(actors_count, args.commands, command)
+        print(f'{actors_count:>6} {args.commands / threaded:>16.1f} {args.commands / processes:>18.1f}')
+        actors_count *= 2
+
+
+if __name__ == '__main__':
+    main()
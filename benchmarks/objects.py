@@ -0,0 +1,36 @@
+from patterns_otus_course_brailov.geometry.angles import Angle
+from patterns_otus_course_brailov.geometry.vectors import Vector
+
+
+class Tank:
+    """Простейшая реализация Movable для бенчмарков."""
+
+    def __init__(self, position: Vector, velocity: Vector):
+        self._position = position
+        self._velocity = velocity
+
+    def get_position(self) -> Vector:
+        return self._position
+
+    def set_position(self, position: Vector) -> None:
+        self._position = position
+
+    def get_velocity(self) -> Vector:
+        return self._velocity
+
+
+class Turret:
+    """Простейшая реализация Rotating для бенчмарков."""
+
+    def __init__(self, dirrection: Angle, angle_speed: Angle):
+        self._dirrection = dirrection
+        self._angle_speed = angle_speed
+
+    def get_dirrection(self) -> Angle:
+        return self._dirrection
+
+    def set_dirrection(self, dirrection: Angle) -> None:
+        self._dirrection = dirrection
+
+    def get_angle_speed(self) -> Angle:
+        return self._angle_speed
@@ -0,0 +1,253 @@
+"""Набор бенчмарков горячих путей: акторы, составные команды, движение и геометрия.
+
+Каждый случай - функция, которая готовит данные для заданного масштаба
+и возвращает замеряемую функцию. Результат случая - лучшее время одного
+вызова из нескольких повторов; количество вызовов в повторе подбирается
+так, чтобы повтор длился не меньше 0.2 секунды.
+
+Запуск: python -m benchmarks --help
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import time
+import timeit
+import typing
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import CommandByFuntion, combine_commands
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.movement.commands import MoveCommand, RotateCommand
+from patterns_otus_course_brailov.profiling import Profiler
+from patterns_otus_course_brailov.snapshot import DeltaEncoder, decode_snapshot, encode_snapshot
+from patterns_otus_course_brailov.world import WorldState
+
+from .objects import Tank, Turret
+
+
+OBJECT_SCALES = (1, 1_000, 100_000)
+ACTOR_SCALES = (1, 4, 16, 64)
+
+Case = typing.Callable[[int], typing.Callable[[], typing.Any]]
+
+_cases: dict[str, tuple[Case, tuple[int, ...], typing.Optional[int]]] = {}
+
+
+def case(
+    name: str,
+    scales: tuple[int, ...] = OBJECT_SCALES,
+    items: typing.Optional[int] = None,
+) -> typing.Callable[[Case], Case]:
+    """Зарегистрировать случай бенчмарка.
+
+    :param scales: масштабы, с которыми запускается случай
+    :param items: сколько элементов обрабатывает один вызов, по умолчанию - равно масштабу
+    """
+    def register(function: Case) -> Case:
+        _cases[name] = (function, scales, items)
+        return function
+    return register
+
+
+def noop() -> None:
+    ...
+
+
+@case('actor.throughput', scales=ACTOR_SCALES, items=10_000)
+def actor_throughput(actors_count: int) -> typing.Callable[[], None]:
+    """10 000 пустых команд, распределенных по `actors_count` акторам."""
+    commands = [CommandByFuntion(noop) for _ in range(10_000 // actors_count)]
+
+    def run() -> None:
+        actors = [Actor(name=f'bench-{i}', batch_size=64) for i in range(actors_count)]
+        for actor in actors:
+            actor.add_commands(commands)
+            actor.start()
+        for actor in actors:
+            actor.soft_stop()
+        for actor in actors:
+            actor.join()
+
+    return run
+
+
+@case('actor.throughput_profiled', scales=(1,), items=10_000)
+def actor_throughput_profiled(actors_count: int) -> typing.Callable[[], None]:
+    """То же, что actor.throughput[1], со снятием стеков 100 раз в секунду."""
+    commands = [CommandByFuntion(noop) for _ in range(10_000)]
+
+    def run() -> None:
+        actor = Actor(name='bench', batch_size=64)
+        profiler = Profiler(frequency=100)
+        profiler.attach(actor)
+        actor.add_commands(commands)
+        actor.start()
+        actor.soft_stop()
+        actor.join()
+        profiler.detach()
+
+    return run
+
+
+@case('command.combine_commands')
+def combine_and_execute(count: int) -> typing.Callable[[], None]:
+    commands = [CommandByFuntion(noop) for _ in range(count)]
+    return lambda: combine_commands(commands).execute()
+
+
+@case('movement.move_command')
+def move_command(count: int) -> typing.Callable[[], None]:
+    commands = [MoveCommand(Tank(Vector(i, i), Vector(1, -1))) for i in range(count)]
+
+    def run() -> None:
+        for command in commands:
+            command.execute()
+
+    return run
+
+
+@case('movement.rotate_command')
+def rotate_command(count: int) -> typing.Callable[[], None]:
+    speed = angles.from_degrees(1)
+    commands = [RotateCommand(Turret(angles.Angle(i), speed)) for i in range(count)]
+
+    def run() -> None:
+        for command in commands:
+            command.execute()
+
+    return run
+
+
+@case('geometry.vector_add')
+def vector_add(count: int) -> typing.Callable[[], None]:
+    vectors = [Vector(i, -i) for i in range(count)]
+    delta = Vector(1, 1)
+    return lambda: [vector + delta for vector in vectors]
+
+
+@case('geometry.vector_rotate')
+def vector_rotate(count: int) -> typing.Callable[[], None]:
+    vectors = [Vector(i, -i) for i in range(count)]
+    angle = angles.from_degrees(10)
+    return lambda: [vector.rotate(angle) for vector in vectors]
+
+
+@case('geometry.angle_add')
+def angle_add(count: int) -> typing.Callable[[], None]:
+    values = [angles.Angle(i) for i in range(count)]
+    delta = angles.from_degrees(1)
+    return lambda: [angle + delta for angle in values]
+
+
+def make_world(count: int) -> WorldState:
+    world = WorldState()
+    for i in range(count):
+        world.add(Vector(i, -i), Vector(1, 0) if i % 100 == 0 else Vector(0, 0))
+    return world
+
+
+@case('world.snapshot_roundtrip')
+def snapshot_roundtrip(count: int) -> typing.Callable[[], None]:
+    world = make_world(count)
+    return lambda: decode_snapshot(encode_snapshot(world))
+
+
+@case('world.delta_1_percent')
+def delta_one_percent(count: int) -> typing.Callable[[], None]:
+    """Дельта тика, в котором двигается каждый сотый объект."""
+    world = make_world(count)
+    encoder = DeltaEncoder(world)
+
+    def run() -> None:
+        world.move_all()
+        encoder.encode()
+
+    return run
+
+
+def run(
+    pattern: str = '*',
+    repeat: int = 5,
+    max_scale: typing.Optional[int] = None,
+) -> dict[str, dict[str, typing.Any]]:
+    """Прогнать подходящие под `pattern` случаи и вернуть результаты по именам."""
+    results = {}
+    for name, (function, scales, items) in _cases.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        for scale in scales:
+            if max_scale is not None and scale > max_scale:
+                continue
+            timer = timeit.Timer(function(scale))
+            number, _ = timer.autorange()
+            seconds = min(timer.repeat(number=number, repeat=repeat)) / number
+            results[f'{name}[{scale}]'] = {
+                'case': name,
+                'scale': scale,
+                'seconds': seconds,
+                'per_item_ns': seconds / (items or scale) * 1e9,
+            }
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, typing.Any]],
+    baseline: dict[str, dict[str, typing.Any]],
+    threshold: float,
+) -> list[str]:
+    """Имена случаев, которые стали медленнее базовых больше чем на `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['seconds'] > base['seconds'] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('-k', '--filter', default='*', help='glob по именам случаев')
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help='куда сохранить результаты')
+    parser.add_argument('--baseline', help='результаты, с которыми сравнивать')
+    parser.add_argument('--threshold', type=float, default=0.2, help='допустимое замедление, доля')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-scale', type=int, help='пропустить масштабы больше этого')
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.max_scale)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    print(f'{"case":<40} {"seconds":>12} {"ns/item":>12} {"vs baseline":>12}')
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f'{result["seconds"] / base["seconds"] - 1:+.1%}' if base else ''
+        print(f'{name:<40} {result["seconds"]:>12.6f} {result["per_item_ns"]:>12.1f} {change:>12}')
+
+    with open(args.output, 'w') as file:
+        json.dump(
+            {
+                'meta': {
+                    'python': sys.version,
+                    'platform': platform.platform(),
+                    'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                },
+                'results': results,
+            },
+            file,
+            indent=2,
+        )
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f'Regressions over {args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+    return 0
@@ -1,43 +1,139 @@
-import queue
+import concurrent.futures
 import logging
+import time
 import typing
 from abc import abstractmethod
 from contextlib import contextmanager
-from threading import Thread, Event, current_thread
+from contextvars import ContextVar
+from threading import Thread, Event
 
 from .command import Command
+from .mailbox import Batch, Lane, Mailbox, MailboxFull
+from .metrics import ActorMetrics, TimedCommand
+from .timers import TimerHandle, TimerQueue
 
+if typing.TYPE_CHECKING:
+    from .journal import Journal
 
-_context: dict[str, 'Actor'] = {}
+
+class ActorContext(typing.Protocol):
+    """То, что команды получают в качестве актора: Actor, AsyncActor, WorkerContext и т.п."""
+
+    @property
+    def name(self) -> str:
+        raise NotImplementedError
+
+
+_context: dict[str, ActorContext] = {}
+
+# актор, команды которого исполняются в текущем потоке (или задаче asyncio)
+_current_actor: ContextVar[typing.Optional[ActorContext]] = ContextVar('current_actor', default=None)
 
 
 @contextmanager
-def _set_context(actor: 'Actor'):
-    _context[actor.name] = actor
+def bind_context(actor: ActorContext, register: bool = False):
+    """Связать актор с потоком (или задачей asyncio), который исполняет его команды.
+
+    :param register: на то же время сделать актор доступным через `get_context` по имени
+    """
+    if register:
+        _context[actor.name] = actor
+    token = _current_actor.set(actor)
     try:
         yield
     finally:
-        _context.pop(actor.name)
+        _current_actor.reset(token)
+        # актор с таким же именем мог зарегистрироваться позже
+        if register and _context.get(actor.name) is actor:
+            del _context[actor.name]
+
+
+def set_context(actor: ActorContext) -> None:
+    """Связать актор с текущим потоком и зарегистрировать по имени без отмены.
+
+    Для потоков и процессов, которые живут ровно столько же, сколько актор
+    (например, процесс-исполнитель ProcessActor).
+    """
+    _context[actor.name] = actor
+    _current_actor.set(actor)
 
 
-def get_context(actor_name: str) -> typing.Optional['Actor']:
+def get_context(actor_name: str) -> typing.Optional[ActorContext]:
+    """Найти запущенный актор по имени."""
     return _context.get(actor_name)
 
 
-class Actor:
-    """В отельном потоке читает команды из очереди и исполняет их."""
+def current_actor() -> typing.Optional[ActorContext]:
+    """Актор, команды которого исполняются в текущем потоке (или задаче asyncio)."""
+    return _current_actor.get()
+
+
+class ExecutionHook(typing.Protocol):
+    """Наблюдатель за исполнением команд актора. Вызывается в потоке актора и не должен бросать исключения."""
 
-    def __init__(self, name: typing.Optional[str] = None):
+    def before(self, command: Command) -> None:
+        """Команда сейчас начнет исполняться."""
+        raise NotImplementedError
+
+    def after(self, command: Command, error: typing.Optional[Exception]) -> None:
+        """Команда исполнилась; `error` - ее исключение, если оно было."""
+        raise NotImplementedError
+
+
+class Actor:
+    """В отельном потоке читает команды из очереди и исполняет их.
+
+    Пока очередь пуста, поток актора спит на очереди и не тратит процессорное время.
+    Отложенные команды (`schedule`, `schedule_every`) исполняются тем же потоком:
+    актор спит на очереди не дольше, чем до срабатывания ближайшей из них.
+    """
+
+    def __init__(
+        self,
+        name: typing.Optional[str] = None,
+        batch_size: int = 1,
+        mailbox: typing.Optional[Mailbox] = None,
+        metrics: typing.Optional[ActorMetrics] = None,
+        journal: typing.Optional['Journal'] = None,
+    ):
         """Конструктор актора.
 
         :param thread_name: имя для актора
+        :param batch_size: сколько команд актор забирает из очереди за одно обращение к ней
+        :param mailbox: очередь команд актора, по умолчанию - неограниченная
+        :param metrics: куда собирать метрики исполнения команд, по умолчанию не собираются
+        :param journal: куда записывать команды перед исполнением, по умолчанию не записываются
         """
-        self._queue = queue.Queue()
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive.')
+
+        self._mailbox = mailbox if mailbox is not None else Mailbox()
+        self._batch_size = batch_size
 
         self._thread = Thread(name=name, target=self._loop)
         self._hard_stop_event = Event()
         self._soft_stop_event = Event()
 
+        self._timers = TimerQueue()
+        # пачка команд, забранная из очереди; неисполненный остаток отдает `drain`
+        self._batch = Batch()
+        # future команд, отправленных через submit и еще не исполненных
+        self._pending_futures: set[concurrent.futures.Future] = set()
+        self._stopped = False
+        self._cancel_pending = True
+        # time.monotonic() начала текущей команды, None - актор ждет команды
+        self._heartbeat: typing.Optional[float] = None
+        self._hooks: tuple[ExecutionHook, ...] = ()
+        self._mailbox.add_evict_listener(self._on_evicted)
+
+        self._idle_time = 0.0
+        self._busy_time = 0.0
+
+        self._journal = journal
+        self._metrics = metrics
+        if metrics is not None:
+            metrics.bind(self.name, self._mailbox.__len__)
+
         self._logger = logging.getLogger(name=f'{__name__}.actor.{name}')
 
     def __repr__(self) -> str:
@@ -47,52 +143,344 @@ class Actor:
     def name(self):
         return self._thread.name
 
-    def add_command(self, command: Command):
-        """Положить команду в очередь актору. (thread-safe)"""
-        self._queue.put(command)
+    @property
+    def mailbox(self) -> Mailbox:
+        return self._mailbox
+
+    @property
+    def metrics(self) -> typing.Optional[ActorMetrics]:
+        return self._metrics
+
+    @property
+    def journal(self) -> typing.Optional['Journal']:
+        return self._journal
+
+    @property
+    def heartbeat(self) -> typing.Optional[float]:
+        """Момент (time.monotonic()) начала исполняемой сейчас команды, None - если актор ждет команд."""
+        return self._heartbeat
+
+    @property
+    def idle_time(self) -> float:
+        """Сколько секунд актор провел в ожидании команд."""
+        return self._idle_time
+
+    @property
+    def busy_time(self) -> float:
+        """Сколько секунд актор провел за исполнением команд."""
+        return self._busy_time
+
+    def add_command(self, command: Command, lane: Lane = Lane.SIMULATION) -> bool:
+        """Положить команду в очередь актору. (thread-safe)
+
+        Возвращает False, если очередь переполнена и команда была отброшена.
+        При переполнении может бросить MailboxFull, см. OverflowPolicy.
+        Если у актора есть журнал, команда должна быть в нем зарегистрирована, иначе - JournalError.
+
+        :param lane: полоса очереди, определяющая приоритет команды
+        """
+        accepted = self._mailbox.put(self._wrap(command), lane)
+        self._observe_queue_depth()
+        return accepted
+
+    def add_commands(self, commands: typing.Iterable[Command], lane: Lane = Lane.SIMULATION) -> int:
+        """Положить несколько команд в очередь актору одним обращением. (thread-safe)
+
+        Возвращает количество принятых команд.
+        """
+        accepted = self._mailbox.put_many(map(self._wrap, commands), lane)
+        self._observe_queue_depth()
+        return accepted
+
+    def submit(self, command: Command, lane: Lane = Lane.SIMULATION) -> concurrent.futures.Future:
+        """Положить команду в очередь и вернуть future с результатом ее исполнения. (thread-safe)
+
+        Исключение команды попадает в future, а не в лог. В asyncio future можно
+        дождаться через `asyncio.wrap_future`. Если актор остановится раньше, чем
+        исполнит команду, или очередь отбросит ее при переполнении, future будет отменен.
+        Если очередь бросила MailboxFull, future тоже отменяется, а исключение пробрасывается.
+        """
+        wrapped = self._wrap(command)
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._pending_futures.add(future)
+        try:
+            accepted = self._mailbox.put(_FutureCommand(wrapped, future, self._pending_futures), lane)
+        except Exception:
+            self._cancel_future(future)
+            raise
+        if not accepted:
+            self._cancel_future(future)
+        self._observe_queue_depth()
+        if self._stopped and self._cancel_pending:
+            self._cancel_future(future)
+        return future
+
+    def submit_many(
+        self,
+        commands: typing.Iterable[Command],
+        lane: Lane = Lane.SIMULATION,
+    ) -> list[concurrent.futures.Future]:
+        """Положить несколько команд в очередь одним обращением. (thread-safe)
+
+        Возвращает future команд в том же порядке, см. `submit`. Если очередь переполнилась
+        на середине пачки, MailboxFull не бросается: принимается начало пачки, а future
+        остальных команд отменяются, как и при отбрасывании команд очередью.
+        """
+        pending = self._pending_futures
+        futures = []
+        wrapped = []
+        # все команды оборачиваются до первого future, чтобы JournalError не оставил их в ожидании
+        commands = [self._wrap(command) for command in commands]
+        for command in commands:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            pending.add(future)
+            futures.append(future)
+            wrapped.append(_FutureCommand(command, future, pending))
+        try:
+            accepted = self._mailbox.put_many(wrapped, lane)
+        except MailboxFull as error:
+            accepted = error.accepted
+        # очередь принимает начало пачки, остальное отброшено
+        for future in futures[accepted:]:
+            self._cancel_future(future)
+        self._observe_queue_depth()
+        if self._stopped and self._cancel_pending:
+            for future in futures:
+                self._cancel_future(future)
+        return futures
+
+    def _wrap(self, command: Command, enqueued_at: typing.Optional[float] = None) -> Command:
+        metrics = self._metrics
+        wrapped = command if metrics is None else TimedCommand(command, metrics, enqueued_at)
+        if self._journal is not None:
+            wrapped = self._journal.wrap(command, wrapped)
+        return wrapped
+
+    def _observe_queue_depth(self) -> None:
+        if self._metrics is not None:
+            self._metrics.observe_queue_depth(len(self._mailbox))
+
+    @staticmethod
+    def _on_evicted(command: Command) -> None:
+        if isinstance(command, _FutureCommand):
+            command.cancel()
+
+    def _cancel_future(self, future: concurrent.futures.Future) -> None:
+        future.cancel()
+        self._pending_futures.discard(future)
+
+    def add_hook(self, hook: ExecutionHook) -> None:
+        """Вызывать `hook` до и после исполнения каждой команды в потоке актора. (thread-safe)"""
+        self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: ExecutionHook) -> None:
+        self._hooks = tuple(existing for existing in self._hooks if existing is not hook)
+
+    def schedule(self, command: Command, delay: float) -> TimerHandle:
+        """Исполнить команду через `delay` секунд. (thread-safe)
+
+        Отложенные команды, не успевшие сработать до остановки актора, не исполняются.
+        Если у актора есть журнал, команда записывается в него при каждом срабатывании
+        и должна быть в нем зарегистрирована, иначе - JournalError.
+        """
+        return self._add_timer(TimerHandle(command, time.monotonic() + delay))
+
+    def schedule_every(
+        self,
+        command: Command,
+        interval: float,
+        first_delay: typing.Optional[float] = None,
+    ) -> TimerHandle:
+        """Исполнять команду каждые `interval` секунд, пока таймер не отменят. (thread-safe)
+
+        :param first_delay: через сколько секунд исполнить команду впервые, по умолчанию - `interval`
+        """
+        if interval <= 0:
+            raise ValueError('interval must be positive.')
+        delay = interval if first_delay is None else first_delay
+        return self._add_timer(TimerHandle(command, time.monotonic() + delay, interval))
+
+    def _add_timer(self, handle: TimerHandle) -> TimerHandle:
+        if self._journal is not None:
+            # незарегистрированная команда должна отклоняться сразу, а не при срабатывании
+            self._journal.wrap(handle.command)
+        if self._timers.push(handle):
+            # актор мог уснуть до срабатывания прежнего ближайшего таймера
+            self._mailbox.wakeup()
+        return handle
 
     def start(self) -> None:
         """Запустить актор."""
         self._thread.start()
 
-    def hard_stop(self) -> None:
-        """Остановить актор не дожидаясь завершения исполнения имеющихся команд."""
+    def hard_stop(self, cancel_pending: bool = True) -> None:
+        """Остановить актор не дожидаясь завершения исполнения имеющихся команд.
+
+        Неисполненные команды остаются в очереди, их можно забрать через `drain`.
+
+        :param cancel_pending: отменить future неисполненных команд, отправленных через `submit`
+        """
+        self._cancel_pending = cancel_pending
         self._hard_stop_event.set()
+        self._mailbox.wakeup()
 
     def soft_stop(self) -> None:
         """Остановить актор после завершения исполнения имеющихся команд."""
         self._soft_stop_event.set()
+        self._mailbox.wakeup()
 
     def join(self, timeout: typing.Optional[float] = None) -> None:
         """Блокировать вызывающий поток до тех пор, пока не остановится актор."""
         if self._thread.is_alive():
             self._thread.join(timeout)
 
-    def _get_from_queue(self) -> typing.Optional[Command]:
-        try:
-            return self._queue.get(block=False)
-        except queue.Empty:
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def thread_ident(self) -> typing.Optional[int]:
+        """Идентификатор потока актора, None - если актор не запущен."""
+        return self._thread.ident
+
+    def stop_requested(self) -> bool:
+        """Была ли запрошена остановка актора (hard_stop или soft_stop)."""
+        return self._hard_stop_event.is_set() or self._soft_stop_event.is_set()
+
+    def drain(self) -> list[tuple[Lane, Command]]:
+        """Забрать все неисполненные команды вместе с их полосами. (thread-safe)
+
+        Первыми идут команды текущей пачки, которые актор уже забрал из очереди, но
+        не исполнил (например, из-за hard_stop), затем - команды из очереди. Команды
+        забираются в том виде, в котором лежат в очереди (с обертками метрик, журнала
+        и future), поэтому их можно переложить в очередь другого актора через
+        `Mailbox.put_front`.
+        """
+        return self._mailbox.drain(self._batch)
+
+    def _get_from_queue(self, timeout: typing.Optional[float] = None) -> bool:
+        """Забрать пачку команд в `_batch`; False - если команд не дождались."""
+        started_at = time.perf_counter()
+        received = self._mailbox.get_batch(self._batch, self._batch_size, timeout)
+        self._idle_time += time.perf_counter() - started_at
+        return received
+
+    def _run_due_timers(self) -> typing.Optional[float]:
+        """Исполнить сработавшие таймеры и вернуть, сколько секунд ждать до следующего."""
+        timers = self._timers
+        if not timers:
             return None
 
+        due = timers.pop_due(time.monotonic())
+        if due:
+            started_at = time.perf_counter()
+            for handle in due:
+                if self._hard_stop_event.is_set():
+                    break
+                now = time.monotonic()
+                self._heartbeat = now
+                # ожидание таймерной команды считается от момента, когда она должна была сработать
+                enqueued_at = time.perf_counter() - (now - handle.deadline)
+                self._safe_execute_command(self._wrap(handle.command, enqueued_at))
+                if handle.interval is not None and not handle.cancelled:
+                    timers.reschedule(handle, time.monotonic())
+            self._busy_time += time.perf_counter() - started_at
+            self._heartbeat = None
+
+        deadline = timers.next_deadline()
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0)
+
     def _safe_execute_command(self, command: Command):
+        hooks = self._hooks
+        if not hooks:
+            try:
+                command.execute()
+            except Exception:
+                self._logger.exception('Error command execution.')
+            return
+
+        for hook in hooks:
+            hook.before(command)
+        error = None
         try:
             command.execute()
-        except Exception:
+        except Exception as exception:
+            error = exception
             self._logger.exception('Error command execution.')
+        for hook in hooks:
+            hook.after(command, error)
+
+    def _execute_batch(self) -> None:
+        started_at = time.perf_counter()
+        hard_stop_is_set = self._hard_stop_event.is_set
+        monotonic = time.monotonic
+        batch = self._batch
+        for index, command in enumerate(batch.commands):
+            # команда из пачки может сама остановить актор (hard_stop_command):
+            # остаток пачки остается в `_batch` и первым отдается через `drain`
+            if hard_stop_is_set():
+                break
+            batch.next = index + 1
+            if batch.drained and not self._mailbox.owns(batch, index):
+                # остаток пачки, начиная с этой команды, уже забран через `drain`
+                break
+            self._heartbeat = monotonic()
+            self._safe_execute_command(command)
+        self._heartbeat = None
+        self._busy_time += time.perf_counter() - started_at
 
     def _loop(self) -> None:
-        with _set_context(self):
+        with bind_context(self, register=True):
             while True:
                 if self._hard_stop_event.is_set():
                     break
 
-                command = self._get_from_queue()
+                timeout = self._run_due_timers()
+                if self._hard_stop_event.is_set():
+                    break
+
+                if self._get_from_queue(timeout):
+                    self._execute_batch()
+                elif self._soft_stop_event.is_set():
+                    break
+
+        # submit после этой точки сам отменит свой future
+        self._stopped = True
+        if self._cancel_pending:
+            for future in list(self._pending_futures):
+                self._cancel_future(future)
+
+
+class _FutureCommand(Command):
+    """Передает результат или исключение команды в future."""
 
-                if command is None:
-                    if self._soft_stop_event.is_set():
-                        break
-                else:
-                    self._safe_execute_command(command)
+    def __init__(
+        self,
+        command: Command,
+        future: concurrent.futures.Future,
+        pending: set[concurrent.futures.Future],
+    ) -> None:
+        self.command = command
+        self.future = future
+        self._pending = pending
+
+    def cancel(self) -> None:
+        """Отменить future: команда не будет исполнена."""
+        self.future.cancel()
+        self._pending.discard(self.future)
+
+    def execute(self) -> None:
+        future = self.future
+        self._pending.discard(future)
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.command.execute()
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
 
 
 class ActorCommand(Command):
@@ -101,11 +489,10 @@ class ActorCommand(Command):
         ...
 
     def execute(self) -> None:
-        actor_name = current_thread().name
-        actor_ctx = get_context(actor_name)
+        actor_ctx = _current_actor.get()
         if actor_ctx is None:
-            raise RuntimeError(f'No context for thread "{actor_name}".')
-        self.actor_action(actor_ctx)
+            raise RuntimeError('No actor context for the current thread.')
+        return self.actor_action(actor_ctx)
 
 
 class ActorCommandByFunction(ActorCommand):
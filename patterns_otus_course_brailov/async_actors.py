@@ -0,0 +1,102 @@
+import asyncio
+import inspect
+import logging
+import typing
+
+from .actors import bind_context
+from .command import Command
+
+
+class AsyncActor:
+    """Читает команды из очереди и исполняет их в задаче asyncio.
+
+    Если `execute` команды возвращает awaitable (например, корутину),
+    актор дожидается его перед тем, как взять следующую команду.
+    """
+
+    def __init__(self, name: typing.Optional[str] = None, maxsize: int = 0):
+        """Конструктор актора.
+
+        :param name: имя для актора
+        :param maxsize: емкость очереди, 0 - без ограничения
+        """
+        self._name = name or f'AsyncActor-{id(self):x}'
+        self._queue: 'asyncio.Queue[typing.Optional[Command]]' = asyncio.Queue(maxsize)
+        self._task: typing.Optional['asyncio.Task[None]'] = None
+        self._hard_stop = False
+        self._soft_stop = False
+
+        self._logger = logging.getLogger(name=f'{__name__}.actor.{name}')
+
+    def __repr__(self) -> str:
+        return f'<AsyncActor: {self.name}>'
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def add_command(self, command: Command) -> None:
+        """Положить команду в очередь актору, дождавшись места в очереди."""
+        await self._queue.put(command)
+
+    def add_command_nowait(self, command: Command) -> None:
+        """Положить команду в очередь актору. Бросает asyncio.QueueFull, если места нет."""
+        self._queue.put_nowait(command)
+
+    def start(self) -> None:
+        """Запустить актор в текущем цикле событий."""
+        self._task = asyncio.get_running_loop().create_task(self._loop(), name=self._name)
+
+    def hard_stop(self) -> None:
+        """Остановить актор не дожидаясь завершения исполнения имеющихся команд."""
+        self._hard_stop = True
+        self._wakeup()
+
+    def soft_stop(self) -> None:
+        """Остановить актор после завершения исполнения имеющихся команд."""
+        self._soft_stop = True
+        self._wakeup()
+
+    async def join(self, timeout: typing.Optional[float] = None) -> None:
+        """Дождаться остановки актора."""
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _wakeup(self) -> None:
+        # пустая команда будит актор, ожидающий на пустой очереди
+        if self._queue.empty():
+            self._queue.put_nowait(None)
+
+    async def _safe_execute_command(self, command: Command) -> None:
+        try:
+            result = command.execute()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            self._logger.exception('Error command execution.')
+
+    async def _loop(self) -> None:
+        # у каждой задачи asyncio своя копия контекста,
+        # поэтому акторы одного цикла событий не мешают друг другу
+        with bind_context(self):
+            await self._process_queue()
+
+    async def _process_queue(self) -> None:
+        queue = self._queue
+        while True:
+            if self._hard_stop:
+                break
+
+            if queue.empty():
+                if self._soft_stop:
+                    break
+                command = await queue.get()
+            else:
+                command = queue.get_nowait()
+
+            if command is not None:
+                await self._safe_execute_command(command)
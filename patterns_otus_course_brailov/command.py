@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from functools import reduce
 import typing
 
 
@@ -17,20 +16,73 @@ class CommandByFuntion(Command):
         return self._callable()
 
 
-def combine_two_commands(first_command: Command, second_command: Command) -> Command:
-    def combination() -> None:
-        first_command.execute()
-        second_command.execute()
+class MacroCommandError(Exception):
+    """Ошибки команд, собранные MacroCommand в режиме collect_errors."""
+
+    def __init__(self, errors: list[Exception]) -> None:
+        super().__init__(f'{len(errors)} command(s) failed.')
+        self.errors = errors
+
+
+class MacroCommand(Command):
+    """Исполняет команды по очереди в одном цикле, без вложенных вызовов.
+
+    Вложенные MacroCommand с тем же режимом обработки ошибок разворачиваются
+    в плоский список. По умолчанию исполнение прерывается на первой ошибке;
+    с `collect_errors=True` исполняются все команды, а ошибки бросаются
+    вместе в MacroCommandError.
+    """
+
+    def __init__(self, commands: typing.Iterable[Command] = (), collect_errors: bool = False) -> None:
+        self._collect_errors = collect_errors
+        self._commands = tuple(self._flatten(commands))
+
+    @property
+    def commands(self) -> tuple[Command, ...]:
+        return self._commands
+
+    def __len__(self) -> int:
+        return len(self._commands)
 
-    return CommandByFuntion(combination)
+    def append(self, command: Command) -> 'MacroCommand':
+        """Новая команда, дополнительно исполняющая `command` в конце."""
+        return self.extend((command,))
+
+    def extend(self, commands: typing.Iterable[Command]) -> 'MacroCommand':
+        """Новая команда, дополнительно исполняющая `commands` в конце."""
+        combined = MacroCommand(collect_errors=self._collect_errors)
+        combined._commands = self._commands + tuple(self._flatten(commands))
+        return combined
+
+    def execute(self) -> None:
+        if not self._collect_errors:
+            for command in self._commands:
+                command.execute()
+            return
+
+        errors = []
+        for command in self._commands:
+            try:
+                command.execute()
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise MacroCommandError(errors)
+
+    def _flatten(self, commands: typing.Iterable[Command]) -> typing.Iterator[Command]:
+        for command in commands:
+            if isinstance(command, MacroCommand) and command._collect_errors == self._collect_errors:
+                yield from command._commands
+            else:
+                yield command
+
+
+def combine_two_commands(first_command: Command, second_command: Command) -> Command:
+    return MacroCommand((first_command, second_command))
 
 
 empty_command = CommandByFuntion(callable=lambda: ...)
 
 
-def combine_commands(commands: list[Command]) -> Command:
-    return reduce(
-        function=combine_two_commands,
-        sequence=commands,
-        initial=empty_command,
-    )
+def combine_commands(commands: typing.Iterable[Command]) -> Command:
+    return MacroCommand(commands)
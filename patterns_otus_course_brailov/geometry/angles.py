@@ -2,24 +2,66 @@ import math
 
 
 def normalize(value: float, period: float) -> float:
+    """Привести значение к полуинтервалу [-period/2, period/2).
+
+    Бесконечность и NaN приводятся к NaN, как и раньше.
+    """
     bound = period / 2
-    if value >= bound:
-        cycles = value // period + 1
-        return value - period*cycles
-    if value < -bound:
-        cycles = value // -period + 1
-        return value + period*cycles
-    return value
+    if -bound <= value < bound:
+        return value
+    if not math.isfinite(value):
+        return math.nan
+    result = value - period*math.floor((value + bound) / period)
+    # защита от ошибок округления на границах полуинтервала
+    if result >= bound:
+        return result - period
+    if result < -bound:
+        return result + period
+    return result
 
 
 class Angle:
+    """Угол в радианах, приведенный к полуинтервалу [-pi, pi).
+
+    Объекты неизменяемые, поэтому косинус, синус и градусы
+    вычисляются при первом обращении и запоминаются.
+    """
+
+    __slots__ = ('_radians', '_cos', '_sin', '_degrees')
+
     def __init__(self, radians: float):
-        self._radians = normalize(radians, period=2*math.pi)
+        if not -math.pi <= radians < math.pi:
+            radians = normalize(radians, period=2*math.pi)
+        self._radians = radians
 
     @property
     def radians(self) -> float:
         return self._radians
 
+    @property
+    def cos(self) -> float:
+        try:
+            return self._cos
+        except AttributeError:
+            self._cos = math.cos(self._radians)
+            return self._cos
+
+    @property
+    def sin(self) -> float:
+        try:
+            return self._sin
+        except AttributeError:
+            self._sin = math.sin(self._radians)
+            return self._sin
+
+    @property
+    def degrees(self) -> float:
+        try:
+            return self._degrees
+        except AttributeError:
+            self._degrees = radians_to_degrees(self._radians)
+            return self._degrees
+
     def __add__(self, other) -> 'Angle':
         if not isinstance(other, Angle):
             raise ValueError
@@ -70,7 +112,7 @@ def degrees_to_radians(degrees: float) -> float:
 
 
 def degrees(angle: Angle) -> float:
-    return radians_to_degrees(angle.radians)
+    return angle.degrees
 
 
 def pi_coefficient(angle: Angle) -> float:
@@ -81,5 +123,16 @@ def from_pi_coefficient(coefficient: float) -> Angle:
     return Angle(coefficient * math.pi)
 
 
+# общие экземпляры для основных направлений, чтобы не создавать их заново
+_headings: dict[float, Angle] = {
+    degrees: Angle(degrees_to_radians(degrees))
+    for degrees in (-180, -90, 0, 90, 180, 270)
+}
+
+
 def from_degrees(degrees: float) -> Angle:
+    """Угол из градусов. Для 0, 90, 180 и 270 градусов отдает общие экземпляры."""
+    heading = _headings.get(degrees)
+    if heading is not None:
+        return heading
     return Angle(degrees_to_radians(degrees))
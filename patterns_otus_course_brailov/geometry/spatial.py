@@ -0,0 +1,173 @@
+import math
+import typing
+
+from ..movement.interfaces import Movable
+from .vectors import Vector
+
+
+Key = typing.Hashable
+Cell = tuple[int, int]
+
+
+class UniformGrid:
+    """Пространственный индекс на равномерной сетке.
+
+    Плоскость разбита на квадратные ячейки со стороной `cell_size`; каждый
+    объект лежит в ячейке своей позиции. Запросы просматривают только
+    ячейки, пересекающие область запроса, поэтому `cell_size` стоит выбирать
+    порядка характерного радиуса запросов.
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        if cell_size <= 0:
+            raise ValueError('cell_size must be positive.')
+        self._cell_size = cell_size
+        self._cells: dict[Cell, dict[Key, Vector]] = {}
+        self._positions: dict[Key, Vector] = {}
+        self._key_cells: dict[Key, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._positions
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    def position(self, key: Key) -> Vector:
+        return self._positions[key]
+
+    def insert(self, key: Key, position: Vector) -> None:
+        """Добавить объект или обновить его позицию."""
+        cell = self._cell(position)
+        old_cell = self._key_cells.get(key)
+        if old_cell is not None and old_cell != cell:
+            self._remove_from_cell(old_cell, key)
+        self._cells.setdefault(cell, {})[key] = position
+        self._positions[key] = position
+        self._key_cells[key] = cell
+
+    update = insert
+
+    def insert_many(self, items: typing.Iterable[tuple[Key, Vector]]) -> None:
+        """Добавить несколько объектов."""
+        insert = self.insert
+        for key, position in items:
+            insert(key, position)
+
+    def remove(self, key: Key) -> None:
+        cell = self._key_cells.pop(key)
+        del self._positions[key]
+        self._remove_from_cell(cell, key)
+
+    def query_rect(self, lower: Vector, upper: Vector) -> list[Key]:
+        """Объекты, лежащие в прямоугольнике [lower, upper]."""
+        min_x, min_y = lower
+        max_x, max_y = upper
+        return [
+            key
+            for cell in self._cells_in_rect(min_x, min_y, max_x, max_y)
+            for key, (x, y) in self._cells[cell].items()
+            if min_x <= x <= max_x and min_y <= y <= max_y
+        ]
+
+    def query_radius(self, center: Vector, radius: float) -> list[Key]:
+        """Объекты, находящиеся не дальше `radius` от `center`."""
+        cx, cy = center
+        radius_squared = radius * radius
+        result = []
+        for cell in self._cells_in_rect(cx - radius, cy - radius, cx + radius, cy + radius):
+            for key, (x, y) in self._cells[cell].items():
+                dx, dy = x - cx, y - cy
+                if dx*dx + dy*dy <= radius_squared:
+                    result.append(key)
+        return result
+
+    def pairs_within(self, distance: float) -> list[tuple[Key, Key]]:
+        """Все пары объектов, находящихся не дальше `distance` друг от друга."""
+        distance_squared = distance * distance
+        reach = math.ceil(distance / self._cell_size)
+        # просматриваем только "половину" соседей, чтобы каждая пара попала в ответ один раз
+        neighbours = [
+            (dx, dy)
+            for dx in range(0, reach + 1)
+            for dy in range(-reach, reach + 1)
+            if dx > 0 or dy > 0
+        ]
+        cells = self._cells
+        result = []
+        for (cell_x, cell_y), items in cells.items():
+            entries = list(items.items())
+            for index, (key, (x, y)) in enumerate(entries):
+                for other_key, (other_x, other_y) in entries[index + 1:]:
+                    dx, dy = x - other_x, y - other_y
+                    if dx*dx + dy*dy <= distance_squared:
+                        result.append((key, other_key))
+            for dx_cell, dy_cell in neighbours:
+                other_items = cells.get((cell_x + dx_cell, cell_y + dy_cell))
+                if not other_items:
+                    continue
+                for key, (x, y) in entries:
+                    for other_key, (other_x, other_y) in other_items.items():
+                        dx, dy = x - other_x, y - other_y
+                        if dx*dx + dy*dy <= distance_squared:
+                            result.append((key, other_key))
+        return result
+
+    def _cell(self, position: Vector) -> Cell:
+        size = self._cell_size
+        return math.floor(position.x / size), math.floor(position.y / size)
+
+    def _cells_in_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list[Cell]:
+        size = self._cell_size
+        first_x, first_y = math.floor(min_x / size), math.floor(min_y / size)
+        last_x, last_y = math.floor(max_x / size), math.floor(max_y / size)
+        cells = self._cells
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(cells):
+            # область запроса больше занятой части сетки - дешевле перебрать занятые ячейки
+            return [
+                (x, y) for x, y in cells
+                if first_x <= x <= last_x and first_y <= y <= last_y
+            ]
+        return [
+            (x, y)
+            for x in range(first_x, last_x + 1)
+            for y in range(first_y, last_y + 1)
+            if (x, y) in cells
+        ]
+
+    def _remove_from_cell(self, cell: Cell, key: Key) -> None:
+        items = self._cells[cell]
+        del items[key]
+        if not items:
+            del self._cells[cell]
+
+
+class IndexedMovable(Movable):
+    """Обертка над Movable, обновляющая позицию объекта в пространственном индексе.
+
+    Если двигать объект через обертку (например, `MoveCommand(IndexedMovable(...))`),
+    индекс всегда остается в актуальном состоянии.
+    """
+
+    def __init__(self, movable: Movable, index: UniformGrid, key: Key) -> None:
+        self._movable = movable
+        self._index = index
+        self._key = key
+        index.insert(key, movable.get_position())
+
+    @property
+    def index(self) -> UniformGrid:
+        return self._index
+
+    def get_position(self) -> Vector:
+        return self._movable.get_position()
+
+    def set_position(self, position: Vector) -> None:
+        self._movable.set_position(position)
+        self._index.update(self._key, position)
+
+    def get_velocity(self) -> Vector:
+        return self._movable.get_velocity()
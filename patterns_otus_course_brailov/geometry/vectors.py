@@ -1,5 +1,6 @@
 import math
 import typing
+from array import array
 
 from . import angles
 
@@ -37,13 +38,7 @@ class Vector(typing.NamedTuple):
 
     def rotate(self, angle: angles.Angle) -> 'Vector':
         """Повернуть вектор на величину angle."""
-        if self.angle is None:
-            return self
-
-        return Vector.from_polar(
-            angle=self.angle + angle,
-            dist=self.dist,
-        )
+        return Rotation(angle).apply(self)
 
     def __add__(self, other) -> 'Vector':
         if not isinstance(other, Vector):
@@ -65,6 +60,42 @@ class Vector(typing.NamedTuple):
         return repr(self)
 
 
+class Rotation:
+    """Поворот на угол angle с заранее посчитанными синусом и косинусом.
+
+    Один и тот же объект стоит переиспользовать для всех векторов,
+    поворачиваемых на одинаковый угол.
+    """
+
+    __slots__ = ('angle', 'cos', 'sin')
+
+    def __init__(self, angle: angles.Angle):
+        self.angle = angle
+        self.cos = angle.cos
+        self.sin = angle.sin
+
+    def __repr__(self) -> str:
+        return f'Rotation(angle={self.angle})'
+
+    def apply(self, vector: Vector) -> Vector:
+        """Повернуть вектор."""
+        x, y = vector
+        cos, sin = self.cos, self.sin
+        return Vector(x*cos - y*sin, x*sin + y*cos)
+
+    def apply_many(self, vectors: typing.Iterable[Vector]) -> list[Vector]:
+        """Повернуть несколько векторов."""
+        cos, sin = self.cos, self.sin
+        return [Vector(x*cos - y*sin, x*sin + y*cos) for x, y in vectors]
+
+    def apply_arrays(self, xs: array, ys: array) -> None:
+        """Повернуть векторы, заданные массивами координат, на месте."""
+        cos, sin = self.cos, self.sin
+        rotated_xs = array('d', [x*cos - y*sin for x, y in zip(xs, ys)])
+        ys[:] = array('d', [x*sin + y*cos for x, y in zip(xs, ys)])
+        xs[:] = rotated_xs
+
+
 def roughly_equal(
     v1: 'Vector',
     v2: 'Vector',
@@ -0,0 +1,409 @@
+"""Журнал исполненных команд и их воспроизведение.
+
+Журнал - файл из заголовка и записей `<seq, tag, length, crc32><payload>`.
+`tag` определяет кодек команды в CommandRegistry, `crc32` считается по payload.
+Недописанная при падении запись в конце файла отбрасывается при открытии.
+
+В журнал попадают только команды. Добавление и удаление объектов через
+WorldState.add/remove не записывается, поэтому набор объектов мира, над которым
+воспроизводится журнал, должен совпадать с исходным: объекты, созданные после
+снимка, нужно либо создавать командами из реестра, либо сохранять новый снимок.
+"""
+import enum
+import os
+import struct
+import threading
+import typing
+import zlib
+
+from .actors import ActorCommandByFunction, bind_context, hard_stop_command, soft_stop_command
+from .command import Command
+from .movement.commands import MoveCommand, RotateCommand
+from .snapshot import load_snapshot, snapshot_buffers
+from .world import EntityView, MoveAllCommand, RotateAllCommand, WorldState
+
+
+JOURNAL_MAGIC = b'CJRN'
+VERSION = 1
+
+# магия, версия, резерв
+FILE_HEADER = struct.Struct('<4sHH')
+# номер записи, тег кодека, длина payload, crc32 payload
+RECORD_HEADER = struct.Struct('<QHII')
+
+CHECKPOINT_TAG = 0
+_ENTITY_ID = struct.Struct('<Q')
+_CHECKPOINT = struct.Struct('<QI')
+
+Encoder = typing.Callable[[Command], bytes]
+Decoder = typing.Callable[[bytes, WorldState], Command]
+Path = typing.Union[str, os.PathLike]
+
+
+class JournalError(Exception):
+    """Команду нельзя записать в журнал или журнал не удалось воспроизвести."""
+
+
+class ChecksumMismatch(JournalError):
+    """Состояние после воспроизведения разошлось с состоянием в контрольной точке."""
+
+    def __init__(self, seq: int, expected: int, actual: int) -> None:
+        super().__init__(f'State checksum mismatch at record {seq}: expected {expected:08x}, got {actual:08x}.')
+        self.seq = seq
+        self.expected = expected
+        self.actual = actual
+
+
+class Record(typing.NamedTuple):
+    seq: int
+    tag: int
+    payload: bytes
+
+
+def state_checksum(world: WorldState) -> int:
+    """crc32 снимка мира."""
+    checksum = 0
+    for buffer in snapshot_buffers(world):
+        checksum = zlib.crc32(buffer, checksum)
+    return checksum
+
+
+class CommandRegistry:
+    """Кодеки команд, которые можно записывать в журнал.
+
+    Команды-функции (ActorCommandByFunction) записываются по имени,
+    под которым их функция зарегистрирована через `register_function`.
+    """
+
+    def __init__(self) -> None:
+        self._by_type: dict[type, tuple[int, Encoder]] = {}
+        self._decoders: dict[int, Decoder] = {}
+        self._functions: dict[str, typing.Callable] = {}
+        self._function_names: dict[typing.Callable, str] = {}
+
+    def register(self, tag: int, command_type: type, encode: Encoder, decode: Decoder) -> None:
+        if tag == CHECKPOINT_TAG or not 0 < tag < 1 << 16:
+            raise ValueError(f'Bad tag {tag}.')
+        if tag in self._decoders:
+            raise ValueError(f'Tag {tag} is already registered.')
+        self._by_type[command_type] = (tag, encode)
+        self._decoders[tag] = decode
+
+    def register_function(self, name: str, function: typing.Callable) -> None:
+        """Разрешить записывать ActorCommandByFunction(function) под именем `name`."""
+        self._functions[name] = function
+        self._function_names[function] = name
+
+    def encode(self, command: Command) -> tuple[int, bytes]:
+        codec = self._by_type.get(type(command))
+        if codec is None:
+            raise JournalError(f'{type(command).__name__} is not registered in the journal.')
+        tag, encode = codec
+        return tag, encode(command)
+
+    def decode(self, tag: int, payload: bytes, world: WorldState) -> Command:
+        decode = self._decoders.get(tag)
+        if decode is None:
+            raise JournalError(f'Unknown command tag {tag}.')
+        try:
+            return decode(payload, world)
+        except JournalError:
+            raise
+        except Exception as error:
+            # например, объект, созданный после снимка, которого нет в восстановленном мире
+            raise JournalError(f'Cannot decode command with tag {tag}: {error!r}.') from error
+
+    def _encode_function(self, command: ActorCommandByFunction) -> bytes:
+        name = self._function_names.get(command._callable)
+        if name is None:
+            raise JournalError(f'Function {command._callable!r} is not registered in the journal.')
+        return name.encode()
+
+    def _decode_function(self, payload: bytes, world: WorldState) -> Command:
+        name = payload.decode()
+        function = self._functions.get(name)
+        if function is None:
+            raise JournalError(f'Function {name!r} is not registered in the journal.')
+        return ActorCommandByFunction(function)
+
+
+def _entity_id(target: typing.Any) -> bytes:
+    if not isinstance(target, EntityView):
+        raise JournalError(f'Only WorldState entities can be journaled, got {target!r}.')
+    return _ENTITY_ID.pack(target.id)
+
+
+def _entity(payload: bytes, world: WorldState) -> EntityView:
+    return world.view(_ENTITY_ID.unpack(payload)[0])
+
+
+def default_registry() -> CommandRegistry:
+    """Реестр с командами движения и поворота объектов WorldState и командами остановки актора."""
+    registry = CommandRegistry()
+    registry.register(
+        1, MoveCommand,
+        lambda command: _entity_id(command.movable),
+        lambda payload, world: MoveCommand(_entity(payload, world)),
+    )
+    registry.register(
+        2, RotateCommand,
+        lambda command: _entity_id(command.rotating),
+        lambda payload, world: RotateCommand(_entity(payload, world)),
+    )
+    registry.register(3, ActorCommandByFunction, registry._encode_function, registry._decode_function)
+    registry.register(4, MoveAllCommand, lambda command: b'', lambda payload, world: MoveAllCommand(world))
+    registry.register(5, RotateAllCommand, lambda command: b'', lambda payload, world: RotateAllCommand(world))
+    registry.register_function('hard_stop', hard_stop_command._callable)
+    registry.register_function('soft_stop', soft_stop_command._callable)
+    return registry
+
+
+class FsyncPolicy(enum.Enum):
+    """Когда сбрасывать журнал на диск через fsync."""
+
+    ALWAYS = 'always'
+    """после каждой записи"""
+
+    BATCH = 'batch'
+    """раз в `fsync_every` записей (групповая фиксация) и в `commit`"""
+
+    NEVER = 'never'
+    """только при закрытии, остальное - на усмотрение ОС"""
+
+
+def read_records(path: Path) -> typing.Iterator[Record]:
+    """Записи журнала по порядку. Чтение останавливается на первой недописанной или поврежденной записи."""
+    with open(path, 'rb') as file:
+        _read_file_header(file)
+        yield from _read_records(file)
+
+
+def _read_file_header(file: typing.BinaryIO) -> None:
+    header = file.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise JournalError('Journal header is truncated.')
+    magic, version, _ = FILE_HEADER.unpack(header)
+    if magic != JOURNAL_MAGIC or version != VERSION:
+        raise JournalError(f'Not a journal of version {VERSION}.')
+
+
+def _read_records(file: typing.BinaryIO) -> typing.Iterator[Record]:
+    while True:
+        header = file.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        seq, tag, length, checksum = RECORD_HEADER.unpack(header)
+        payload = file.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        yield Record(seq, tag, payload)
+
+
+class Journal:
+    """Журнал команд, открытый на дозапись. (thread-safe)
+
+    Записи буферизуются; на диск они попадают согласно FsyncPolicy.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        registry: typing.Optional[CommandRegistry] = None,
+        fsync: FsyncPolicy = FsyncPolicy.BATCH,
+        fsync_every: int = 256,
+        buffer_size: int = 1 << 16,
+    ) -> None:
+        if fsync_every < 1:
+            raise ValueError('fsync_every must be positive.')
+        self._registry = registry if registry is not None else default_registry()
+        self._fsync = fsync
+        self._fsync_every = fsync_every
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._unsynced = 0
+
+        end = self._recover(path)
+        self._file = open(path, 'r+b' if end else 'wb', buffering=buffer_size)
+        if end:
+            # отрезаем недописанный при падении хвост
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file.write(FILE_HEADER.pack(JOURNAL_MAGIC, VERSION, 0))
+
+    def _recover(self, path: Path) -> int:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+        with open(path, 'rb') as file:
+            _read_file_header(file)
+            end = file.tell()
+            for record in _read_records(file):
+                self._seq = record.seq
+                end = file.tell()
+        return end
+
+    @property
+    def seq(self) -> int:
+        """Номер последней записи."""
+        return self._seq
+
+    @property
+    def registry(self) -> CommandRegistry:
+        return self._registry
+
+    def wrap(self, command: Command, execute: typing.Optional[Command] = None) -> Command:
+        """Обернуть команду так, чтобы перед исполнением она записывалась в журнал.
+
+        Команда кодируется сразу, поэтому незарегистрированная команда приводит к JournalError
+        еще при отправке. CheckpointCommand не оборачивается: она сама пишет свою запись.
+
+        :param execute: что исполнять вместо `command` (например, ее обертку)
+        """
+        if isinstance(command, CheckpointCommand):
+            return execute if execute is not None else command
+        tag, payload = self._registry.encode(command)
+        return JournaledCommand(execute if execute is not None else command, self, tag, payload)
+
+    def append(self, tag: int, payload: bytes) -> int:
+        """Дописать запись и вернуть ее номер."""
+        with self._lock:
+            self._seq += 1
+            self._file.write(RECORD_HEADER.pack(self._seq, tag, len(payload), zlib.crc32(payload)) + payload)
+            self._unsynced += 1
+            if self._fsync is FsyncPolicy.ALWAYS or (
+                self._fsync is FsyncPolicy.BATCH and self._unsynced >= self._fsync_every
+            ):
+                self._sync_locked()
+            return self._seq
+
+    def checkpoint(self, world: WorldState) -> int:
+        """Записать контрольную сумму состояния мира, которую проверит воспроизведение.
+
+        Сумма верна, только пока команды журнала не исполняются (например, после `Actor.join`).
+        Работающему актору нужно отправить `checkpoint_command`, чтобы сумма посчиталась
+        в его потоке между командами.
+        """
+        return self.append(CHECKPOINT_TAG, _CHECKPOINT.pack(world.capacity, state_checksum(world)))
+
+    def checkpoint_command(self, world: WorldState) -> 'CheckpointCommand':
+        """Команда, записывающая контрольную точку в потоке исполняющего ее актора."""
+        return CheckpointCommand(self, world)
+
+    def commit(self) -> None:
+        """Сбросить накопленные записи на диск (кроме FsyncPolicy.NEVER - только в ОС)."""
+        with self._lock:
+            if self._fsync is FsyncPolicy.NEVER:
+                self._file.flush()
+            else:
+                self._sync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync_locked()
+                self._file.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+    def _sync_locked(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+
+class JournaledCommand(Command):
+    """Записывает команду в журнал непосредственно перед ее исполнением."""
+
+    def __init__(self, command: Command, journal: Journal, tag: int, payload: bytes) -> None:
+        self.command = command
+        self.journal = journal
+        self.tag = tag
+        self.payload = payload
+
+    def execute(self) -> typing.Any:
+        self.journal.append(self.tag, self.payload)
+        return self.command.execute()
+
+
+class CheckpointCommand(Command):
+    """Записывает контрольную точку (см. `Journal.checkpoint`) при исполнении."""
+
+    def __init__(self, journal: Journal, world: WorldState) -> None:
+        self.journal = journal
+        self.world = world
+
+    def execute(self) -> int:
+        return self.journal.checkpoint(self.world)
+
+
+class ReplayResult(typing.NamedTuple):
+    world: WorldState
+    last_seq: int
+    commands: int
+    checkpoints: int
+
+
+def replay(
+    path: Path,
+    world: WorldState,
+    registry: typing.Optional[CommandRegistry] = None,
+    after_seq: int = 0,
+    actor: typing.Any = None,
+    verify: bool = True,
+) -> ReplayResult:
+    """Исполнить команды журнала над миром подряд, без очередей и потоков.
+
+    Ошибки команд при воспроизведении пробрасываются так же, как исключение ChecksumMismatch.
+    Если запись нельзя разобрать (например, она ссылается на объект, которого нет в `world`,
+    см. описание модуля), бросается JournalError.
+
+    :param after_seq: пропустить записи с номерами не больше этого (уже учтенные в снимке)
+    :param actor: контекст для ActorCommand, по умолчанию команды актора пропускаются
+    :param verify: проверять контрольные точки
+    """
+    registry = registry if registry is not None else default_registry()
+    last_seq = after_seq
+    commands = 0
+    checkpoints = 0
+    for seq, tag, payload in read_records(path):
+        if seq <= after_seq:
+            continue
+        last_seq = seq
+        if tag == CHECKPOINT_TAG:
+            if verify:
+                _, expected = _CHECKPOINT.unpack(payload)
+                actual = state_checksum(world)
+                if actual != expected:
+                    raise ChecksumMismatch(seq, expected, actual)
+                checkpoints += 1
+            continue
+        command = registry.decode(tag, payload, world)
+        if isinstance(command, ActorCommandByFunction):
+            if actor is None:
+                continue
+            with bind_context(actor):
+                command.execute()
+        else:
+            command.execute()
+        commands += 1
+    return ReplayResult(world, last_seq, commands, checkpoints)
+
+
+def restore(
+    journal_path: Path,
+    snapshot_path: Path,
+    registry: typing.Optional[CommandRegistry] = None,
+    verify: bool = True,
+) -> ReplayResult:
+    """Восстановить мир из снимка и дописанных после него записей журнала.
+
+    Номером тика снимка должен быть номер последней учтенной в нем записи журнала,
+    т.е. `save_snapshot(world, path, tick=journal.seq)`. Объекты, добавленные в мир
+    после снимка через WorldState.add, в журнале не записаны и не восстанавливаются.
+    """
+    world, seq = load_snapshot(snapshot_path)
+    return replay(journal_path, world, registry, after_seq=seq, verify=verify)
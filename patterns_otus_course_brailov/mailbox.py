@@ -0,0 +1,425 @@
+import collections
+import enum
+import itertools
+import threading
+import typing
+
+from .command import Command
+
+
+class MailboxFull(Exception):
+    """В очереди нет места для новой команды."""
+
+    accepted = 0
+    """сколько команд `Mailbox.put_many` успел положить до переполнения"""
+
+
+class Lane(enum.IntEnum):
+    """Полосы очереди команд в порядке убывания приоритета."""
+
+    CONTROL = 0
+    """управление актором (остановка и т.п.)"""
+
+    INPUT = 1
+    """ввод игроков"""
+
+    SIMULATION = 2
+    """команды симуляции мира"""
+
+    BACKGROUND = 3
+    """фоновые задачи"""
+
+
+_LANES = tuple(Lane)
+
+DEFAULT_LANE_WEIGHTS = {
+    Lane.CONTROL: 8,
+    Lane.INPUT: 4,
+    Lane.SIMULATION: 2,
+    Lane.BACKGROUND: 1,
+}
+
+
+class OverflowPolicy(enum.Enum):
+    """Что делать с новой командой, если очередь заполнена."""
+
+    BLOCK = 'block'
+    """ждать, пока в очереди освободится место"""
+
+    BLOCK_TIMEOUT = 'block_timeout'
+    """ждать не дольше `put_timeout`, затем бросить MailboxFull"""
+
+    DROP_NEWEST = 'drop_newest'
+    """отбросить новую команду"""
+
+    DROP_OLDEST = 'drop_oldest'
+    """отбросить самую старую команду в очереди из полосы не приоритетнее новой, а если таких нет - новую"""
+
+    RAISE = 'raise'
+    """сразу бросить MailboxFull"""
+
+
+class Batch:
+    """Пачка команд, которую получатель забрал из очереди и исполняет по порядку.
+
+    Перед исполнением команды получатель записывает в `next` индекс следующей за ней,
+    а `Mailbox.drain` забирает остаток пачки, начиная с `next`. Если после этого
+    получатель видит `drained`, команду можно исполнять, только если `Mailbox.owns`
+    подтверждает, что она не попала в забранный остаток.
+    """
+
+    def __init__(self) -> None:
+        self.commands: list[Command] = []
+        self.lanes: list[Lane] = []
+        self.next = 0
+        self.drained = False
+        # с какого индекса остаток пачки забран через `Mailbox.drain`
+        self.drained_from: typing.Optional[int] = None
+
+
+class Mailbox:
+    """Потокобезопасная очередь команд актора с блокирующим ожиданием.
+
+    Команды раскладываются по полосам (Lane), внутри полосы сохраняется порядок
+    поступления. Если непустых полос несколько, команды выбираются взвешенным
+    циклическим перебором (smooth weighted round-robin): полоса с весом w получает
+    не меньше w / (сумма весов непустых полос) выборок, поэтому команды управления
+    обслуживаются быстро даже при забитой полосе симуляции, а фоновые не голодают.
+
+    Емкость очереди можно ограничить через `capacity`, тогда при переполнении
+    новая команда обрабатывается согласно `overflow`. Политика DROP_OLDEST
+    отбрасывает самую старую команду из наименее приоритетной непустой полосы,
+    но не приоритетнее полосы новой команды; если таких нет, отбрасывается новая.
+    """
+
+    def __init__(
+        self,
+        capacity: typing.Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        put_timeout: typing.Optional[float] = None,
+        lane_weights: typing.Optional[typing.Mapping[Lane, int]] = None,
+    ) -> None:
+        """Конструктор очереди.
+
+        :param capacity: максимальное количество команд в очереди, None - без ограничения
+        :param overflow: политика обработки переполнения
+        :param put_timeout: сколько секунд ждать места для OverflowPolicy.BLOCK_TIMEOUT
+        :param lane_weights: веса полос, по умолчанию DEFAULT_LANE_WEIGHTS
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError('capacity must be positive.')
+        if overflow is OverflowPolicy.BLOCK_TIMEOUT and put_timeout is None:
+            raise ValueError('put_timeout is required for OverflowPolicy.BLOCK_TIMEOUT.')
+        weights = {**DEFAULT_LANE_WEIGHTS, **(lane_weights or {})}
+        if any(weight < 1 for weight in weights.values()):
+            raise ValueError('lane weights must be positive.')
+
+        self._capacity = capacity
+        self._overflow = overflow
+        self._put_timeout = put_timeout
+
+        self._lanes: tuple[typing.Deque[Command], ...] = tuple(collections.deque() for _ in Lane)
+        self._weights = tuple(weights[lane] for lane in Lane)
+        self._credits = [0] * len(Lane)
+        self._size = 0
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._wakeup_pending = False
+
+        self._dropped = 0
+        self._blocked = 0
+        self._evict_listeners: list[typing.Callable[[Command], None]] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> typing.Optional[int]:
+        return self._capacity
+
+    @property
+    def dropped(self) -> int:
+        """Сколько команд было отброшено из-за переполнения."""
+        return self._dropped
+
+    @property
+    def blocked(self) -> int:
+        """Сколько раз отправителю пришлось ждать места в очереди."""
+        return self._blocked
+
+    def lane_size(self, lane: Lane) -> int:
+        return len(self._lanes[lane])
+
+    def add_evict_listener(self, listener: typing.Callable[[Command], None]) -> None:
+        """Сообщать `listener` о командах, вытесненных из очереди политикой DROP_OLDEST.
+
+        Вызывается в потоке отправителя после освобождения блокировки очереди.
+        """
+        self._evict_listeners.append(listener)
+
+    def put(self, command: Command, lane: Lane = Lane.SIMULATION) -> bool:
+        """Положить команду в очередь и разбудить ожидающего получателя.
+
+        Возвращает False, если команда была отброшена политикой DROP_NEWEST.
+        """
+        evicted: list[Command] = []
+        try:
+            with self._condition:
+                accepted = self._put_locked(command, lane, evicted)
+                if accepted:
+                    self._condition.notify()
+                return accepted
+        finally:
+            if evicted:
+                self._report_evicted(evicted)
+
+    def put_many(self, commands: typing.Iterable[Command], lane: Lane = Lane.SIMULATION) -> int:
+        """Положить несколько команд в очередь за один захват блокировки.
+
+        Возвращает количество принятых команд; принимается всегда начало списка.
+        Если бросается MailboxFull, его `accepted` - сколько команд принято до переполнения.
+        """
+        commands = list(commands)
+        if not commands:
+            return 0
+        queue = self._lanes[lane]
+        evicted: list[Command] = []
+        try:
+            with self._condition:
+                if self._capacity is None:
+                    queue.extend(commands)
+                    self._size += len(commands)
+                    accepted = len(commands)
+                else:
+                    accepted = 0
+                    try:
+                        for command in commands:
+                            if self._put_locked(command, lane, evicted):
+                                accepted += 1
+                                # получатель может разгрузить очередь, пока мы ждем места
+                                self._condition.notify()
+                    except MailboxFull as error:
+                        error.accepted = accepted
+                        raise
+                if accepted:
+                    self._condition.notify()
+                return accepted
+        finally:
+            if evicted:
+                self._report_evicted(evicted)
+
+    def get(self, timeout: typing.Optional[float] = None) -> typing.Optional[Command]:
+        """Достать команду из очереди, при необходимости дождавшись её.
+
+        Возвращает None, если ожидание прервано через `wakeup` или истек `timeout`.
+        """
+        batch = self.get_many(1, timeout)
+        return batch[0] if batch else None
+
+    def get_many(
+        self,
+        max_count: int,
+        timeout: typing.Optional[float] = None,
+    ) -> list[Command]:
+        """Достать до `max_count` команд за один захват блокировки.
+
+        Возвращает пустой список, если ожидание прервано через `wakeup` или истек `timeout`.
+        """
+        with self._condition:
+            if not self._wait_locked(timeout):
+                return []
+            batch = self._pop_locked(max_count)
+            if self._capacity is not None:
+                self._not_full.notify(len(batch))
+            return batch
+
+    def get_batch(self, batch: Batch, max_count: int, timeout: typing.Optional[float] = None) -> bool:
+        """Как `get_many`, но команды с их полосами кладутся в `batch` вместо прежних.
+
+        Пачка заполняется под блокировкой очереди, поэтому `drain` не может пропустить
+        команды, уже забранные из очереди, но еще не попавшие в пачку.
+        Возвращает False, если команд не дождались.
+        """
+        with self._condition:
+            if not self._wait_locked(timeout):
+                return False
+            lanes: list[Lane] = []
+            batch.commands = self._pop_locked(max_count, lanes)
+            batch.lanes = lanes
+            batch.next = 0
+            batch.drained = False
+            batch.drained_from = None
+            if self._capacity is not None:
+                self._not_full.notify(len(lanes))
+            return True
+
+    def owns(self, batch: Batch, index: int) -> bool:
+        """Принадлежит ли команда `index` пачки получателю, а не остатку, забранному через `drain`."""
+        with self._condition:
+            return batch.drained_from is None or index < batch.drained_from
+
+    def drain(self, batch: typing.Optional[Batch] = None) -> list[tuple[Lane, Command]]:
+        """Забрать из очереди все команды вместе с их полосами, не дожидаясь новых.
+
+        :param batch: пачка получателя, неисполненный остаток которой забирается первым
+        """
+        with self._condition:
+            items = []
+            # остаток пачки забирается один раз, пока получатель не возьмет новую
+            if batch is not None and not batch.drained:
+                # сначала флаг, затем индекс: получатель пишет их в обратном порядке (см. Batch)
+                batch.drained = True
+                start = batch.next
+                items.extend(zip(batch.lanes[start:], batch.commands[start:]))
+                batch.drained_from = start
+            items.extend((lane, command) for lane in Lane for command in self._lanes[lane])
+            for queue in self._lanes:
+                queue.clear()
+            self._credits = [0] * len(Lane)
+            self._size = 0
+            if self._capacity is not None:
+                self._not_full.notify_all()
+            return items
+
+    def put_front(self, items: typing.Iterable[tuple[Lane, Command]]) -> None:
+        """Вернуть команды в начало их полос в том же порядке.
+
+        Предназначено для команд, уже побывавших в очереди (например, забранных через `drain`),
+        поэтому емкость очереди не проверяется.
+        """
+        items = list(items)
+        if not items:
+            return
+        with self._condition:
+            lanes = self._lanes
+            for lane, command in reversed(items):
+                lanes[lane].appendleft(command)
+            self._size += len(items)
+            self._condition.notify()
+
+    def put_back(self, items: typing.Iterable[tuple[Lane, Command]]) -> None:
+        """Дописать команды в конец их полос в том же порядке.
+
+        Как и `put_front`, предназначено для команд, уже побывавших в очереди, поэтому
+        емкость очереди не проверяется и команды никогда не отбрасываются.
+        """
+        items = list(items)
+        if not items:
+            return
+        with self._condition:
+            lanes = self._lanes
+            for lane, command in items:
+                lanes[lane].append(command)
+            self._size += len(items)
+            self._condition.notify()
+
+    def wakeup(self) -> None:
+        """Прервать текущее (или ближайшее) ожидание в `get`."""
+        with self._condition:
+            self._wakeup_pending = True
+            self._condition.notify_all()
+
+    def _wait_locked(self, timeout: typing.Optional[float]) -> bool:
+        if not self._size:
+            self._condition.wait_for(self._has_items_or_wakeup, timeout)
+        if not self._size:
+            self._wakeup_pending = False
+            return False
+        return True
+
+    def _has_items_or_wakeup(self) -> bool:
+        return bool(self._size) or self._wakeup_pending
+
+    def _has_free_space(self) -> bool:
+        return self._size < self._capacity
+
+    def _pop_locked(self, max_count: int, batch_lanes: typing.Optional[list[Lane]] = None) -> list[Command]:
+        lanes = self._lanes
+        active = [index for index, queue in enumerate(lanes) if queue]
+        batch: list[Command] = []
+        while len(active) > 1 and len(batch) < max_count:
+            index = self._choose_lane(active)
+            queue = lanes[index]
+            batch.append(queue.popleft())
+            if batch_lanes is not None:
+                batch_lanes.append(_LANES[index])
+            if not queue:
+                active.remove(index)
+                self._credits[index] = 0
+        if active and len(batch) < max_count:
+            # осталась одна непустая полоса - забираем из нее без перебора
+            index = active[0]
+            queue = lanes[index]
+            count = max_count - len(batch)
+            if count >= len(queue):
+                count = len(queue)
+                batch.extend(queue)
+                queue.clear()
+                self._credits[index] = 0
+            else:
+                popleft = queue.popleft
+                batch.extend(popleft() for _ in range(count))
+            if batch_lanes is not None:
+                batch_lanes.extend(itertools.repeat(_LANES[index], count))
+        self._size -= len(batch)
+        return batch
+
+    def _choose_lane(self, active: list[int]) -> int:
+        credits, weights = self._credits, self._weights
+        total = 0
+        chosen = active[0]
+        for index in active:
+            credits[index] += weights[index]
+            total += weights[index]
+            if credits[index] > credits[chosen]:
+                chosen = index
+        credits[chosen] -= total
+        return chosen
+
+    def _drop_oldest_locked(self, lane: Lane) -> typing.Optional[Command]:
+        # команды приоритетнее новой (например, остановка актора) не вытесняются
+        for queue in reversed(self._lanes[lane:]):
+            if queue:
+                self._size -= 1
+                return queue.popleft()
+        return None
+
+    def _report_evicted(self, evicted: list[Command]) -> None:
+        for listener in self._evict_listeners:
+            for command in evicted:
+                listener(command)
+
+    def _put_locked(self, command: Command, lane: Lane, evicted: list[Command]) -> bool:
+        queue = self._lanes[lane]
+        if self._capacity is None or self._size < self._capacity:
+            queue.append(command)
+            self._size += 1
+            return True
+
+        overflow = self._overflow
+        if overflow is OverflowPolicy.DROP_NEWEST:
+            self._dropped += 1
+            return False
+        if overflow is OverflowPolicy.DROP_OLDEST:
+            oldest = self._drop_oldest_locked(lane)
+            if oldest is None:
+                self._dropped += 1
+                return False
+            evicted.append(oldest)
+            queue.append(command)
+            self._size += 1
+            self._dropped += 1
+            return True
+        if overflow is OverflowPolicy.RAISE:
+            raise MailboxFull(f'Mailbox capacity {self._capacity} exceeded.')
+
+        self._blocked += 1
+        if overflow is OverflowPolicy.BLOCK:
+            self._not_full.wait_for(self._has_free_space)
+        elif not self._not_full.wait_for(self._has_free_space, self._put_timeout):
+            raise MailboxFull(f'No space in mailbox for {self._put_timeout} seconds.')
+        queue.append(command)
+        self._size += 1
+        return True
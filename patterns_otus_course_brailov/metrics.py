@@ -0,0 +1,210 @@
+import bisect
+import threading
+import time
+import typing
+
+from .command import Command
+
+
+DEFAULT_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005,
+    0.001, 0.005, 0.01, 0.05,
+    0.1, 0.5, 1.0, float('inf'),
+)
+
+
+class Histogram:
+    """Гистограмма с фиксированными верхними границами корзин (в секундах)."""
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(buckets) or buckets[-1] != float('inf'):
+            raise ValueError('buckets must be sorted and end with inf.')
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            'buckets': list(zip(self.buckets, self.counts)),
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+
+class MetricsSink(typing.Protocol):
+    def export(self, snapshot: dict[str, typing.Any]) -> None:
+        """Принять снимок метрик актора."""
+        raise NotImplementedError
+
+
+class InMemorySink(MetricsSink):
+    """Хранит последний экспортированный снимок."""
+
+    def __init__(self) -> None:
+        self.last: typing.Optional[dict[str, typing.Any]] = None
+
+    def export(self, snapshot: dict[str, typing.Any]) -> None:
+        self.last = snapshot
+
+
+class CallbackSink(MetricsSink):
+    """Передает снимок в функцию."""
+
+    def __init__(self, callback: typing.Callable[[dict[str, typing.Any]], None]) -> None:
+        self._callback = callback
+
+    def export(self, snapshot: dict[str, typing.Any]) -> None:
+        self._callback(snapshot)
+
+
+class TextSink(MetricsSink):
+    """Передает снимок в текстовом формате экспозиции Prometheus."""
+
+    def __init__(self, write: typing.Callable[[str], typing.Any]) -> None:
+        self._write = write
+
+    def export(self, snapshot: dict[str, typing.Any]) -> None:
+        self._write(render_text(snapshot))
+
+
+def _render_histogram(lines: list[str], name: str, labels: str, histogram: dict[str, typing.Any]) -> None:
+    cumulative = 0
+    for bound, count in histogram['buckets']:
+        cumulative += count
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{name}_bucket{{{labels}le="{le}"}} {cumulative}')
+    lines.append(f'{name}_count{{{labels.rstrip(",")}}} {histogram["count"]}')
+    lines.append(f'{name}_sum{{{labels.rstrip(",")}}} {histogram["sum"]}')
+
+
+def render_text(snapshot: dict[str, typing.Any]) -> str:
+    """Снимок метрик в текстовом формате экспозиции Prometheus."""
+    actor = f'actor="{snapshot["actor"]}"'
+    lines = [
+        f'actor_commands_total{{{actor}}} {snapshot["commands"]}',
+        f'actor_errors_total{{{actor}}} {snapshot["errors"]}',
+        f'actor_commands_per_second{{{actor}}} {snapshot["commands_per_second"]}',
+        f'actor_queue_depth{{{actor}}} {snapshot["queue_depth"]}',
+        f'actor_queue_depth_max{{{actor}}} {snapshot["max_queue_depth"]}',
+    ]
+    _render_histogram(lines, 'actor_wait_seconds', f'{actor},', snapshot['wait'])
+    for command_type, histogram in sorted(snapshot['execution'].items()):
+        _render_histogram(lines, 'actor_execution_seconds', f'{actor},command="{command_type}",', histogram)
+    for command_type, errors in sorted(snapshot['errors_by_type'].items()):
+        lines.append(f'actor_command_errors_total{{{actor},command="{command_type}"}} {errors}')
+    return '\n'.join(lines) + '\n'
+
+
+class ActorMetrics:
+    """Метрики исполнения команд актора.
+
+    Собирает время ожидания команд в очереди, время исполнения по типам команд,
+    глубину очереди, пропускную способность и ошибки. Метрики пишет только поток актора, кроме глубины очереди, которую
+    обновляют отправители команд.
+    """
+
+    def __init__(
+        self,
+        sink: typing.Optional[MetricsSink] = None,
+        buckets: typing.Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self._sink = sink
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+
+        self.actor_name = ''
+        self.commands = 0
+        self.errors = 0
+        self.errors_by_type: dict[str, int] = {}
+        self.max_queue_depth = 0
+        self.wait = Histogram(buckets)
+        self.execution: dict[str, Histogram] = {}
+        self._queue_depth: typing.Callable[[], int] = lambda: 0
+
+    def bind(self, actor_name: str, queue_depth: typing.Callable[[], int]) -> None:
+        """Привязать метрики к актору."""
+        self.actor_name = actor_name
+        self._queue_depth = queue_depth
+
+    def observe_queue_depth(self, depth: int) -> None:
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def record(self, command_type: str, wait: float, duration: float, error: bool) -> None:
+        self.commands += 1
+        self.wait.observe(wait)
+        histogram = self.execution.get(command_type)
+        if histogram is None:
+            with self._lock:
+                histogram = self.execution.setdefault(command_type, Histogram(self._buckets))
+        histogram.observe(duration)
+        if error:
+            self.errors += 1
+            self.errors_by_type[command_type] = self.errors_by_type.get(command_type, 0) + 1
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        elapsed = time.perf_counter() - self._started_at
+        with self._lock:
+            execution = dict(self.execution)
+        return {
+            'actor': self.actor_name,
+            'commands': self.commands,
+            'errors': self.errors,
+            'errors_by_type': dict(self.errors_by_type),
+            'commands_per_second': self.commands / elapsed if elapsed > 0 else 0.0,
+            'queue_depth': self._queue_depth(),
+            'max_queue_depth': self.max_queue_depth,
+            'wait': self.wait.snapshot(),
+            'execution': {
+                command_type: histogram.snapshot()
+                for command_type, histogram in execution.items()
+            },
+        }
+
+    def export(self) -> dict[str, typing.Any]:
+        """Снять снимок метрик и передать его в sink."""
+        snapshot = self.snapshot()
+        if self._sink is not None:
+            self._sink.export(snapshot)
+        return snapshot
+
+
+class TimedCommand(Command):
+    """Обертка, которая замеряет ожидание команды в очереди и время ее исполнения."""
+
+    def __init__(
+        self,
+        command: Command,
+        metrics: ActorMetrics,
+        enqueued_at: typing.Optional[float] = None,
+    ) -> None:
+        """Конструктор обертки.
+
+        :param enqueued_at: с какого момента (time.perf_counter()) считать ожидание, по умолчанию - с создания
+        """
+        self.command = command
+        self.metrics = metrics
+        self.enqueued_at = time.perf_counter() if enqueued_at is None else enqueued_at
+
+    def execute(self) -> None:
+        started_at = time.perf_counter()
+        error = False
+        try:
+            return self.command.execute()
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.metrics.record(
+                type(self.command).__name__,
+                wait=started_at - self.enqueued_at,
+                duration=time.perf_counter() - started_at,
+                error=error,
+            )
@@ -0,0 +1,144 @@
+import math
+from array import array
+from operator import add
+
+from ..command import Command
+from ..geometry.angles import Angle, normalize
+from ..geometry.vectors import Vector
+from .interfaces import Movable, Rotating
+
+
+def advance(coordinates: array, speeds: array) -> None:
+    """Сдвинуть все координаты на соответствующие скорости за один проход."""
+    coordinates[:] = array('d', map(add, coordinates, speeds))
+
+
+def advance_angles(radians: array, speeds: array) -> None:
+    """Повернуть все углы на соответствующие скорости и нормализовать их как Angle."""
+    period = 2*math.pi
+    bound = period / 2
+    radians[:] = array('d', [
+        value if -bound <= value < bound else normalize(value, period)
+        for value in map(add, radians, speeds)
+    ])
+
+
+class BatchMovement:
+    """Позиции и скорости множества объектов в непрерывных массивах.
+
+    Вместо отдельной MoveCommand на каждый объект все зарегистрированные
+    объекты двигаются одним шагом `step`.
+    """
+
+    def __init__(self) -> None:
+        self._xs = array('d')
+        self._ys = array('d')
+        self._velocity_xs = array('d')
+        self._velocity_ys = array('d')
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def register(self, position: Vector, velocity: Vector) -> 'BatchMovable':
+        """Добавить объект и получить адаптер к нему с интерфейсом Movable."""
+        self._xs.append(position.x)
+        self._ys.append(position.y)
+        self._velocity_xs.append(velocity.x)
+        self._velocity_ys.append(velocity.y)
+        return BatchMovable(self, len(self._xs) - 1)
+
+    def step(self) -> None:
+        """Сдвинуть все объекты на их скорость."""
+        advance(self._xs, self._velocity_xs)
+        advance(self._ys, self._velocity_ys)
+
+
+class BatchMovable(Movable):
+    """Объект из BatchMovement, доступный через интерфейс Movable."""
+
+    def __init__(self, movement: BatchMovement, index: int) -> None:
+        self._movement = movement
+        self._index = index
+
+    def get_position(self) -> Vector:
+        movement, index = self._movement, self._index
+        return Vector(movement._xs[index], movement._ys[index])
+
+    def set_position(self, position: Vector) -> None:
+        movement, index = self._movement, self._index
+        movement._xs[index] = position.x
+        movement._ys[index] = position.y
+
+    def get_velocity(self) -> Vector:
+        movement, index = self._movement, self._index
+        return Vector(movement._velocity_xs[index], movement._velocity_ys[index])
+
+    def set_velocity(self, velocity: Vector) -> None:
+        movement, index = self._movement, self._index
+        movement._velocity_xs[index] = velocity.x
+        movement._velocity_ys[index] = velocity.y
+
+
+class BatchMoveCommand(Command):
+    """Команда, двигающая все объекты BatchMovement за один вызов."""
+
+    def __init__(self, movement: BatchMovement) -> None:
+        self.movement = movement
+
+    def execute(self) -> None:
+        self.movement.step()
+
+
+class BatchRotation:
+    """Направления и угловые скорости множества объектов в непрерывных массивах.
+
+    Углы хранятся в радианах, нормализованными так же, как в Angle.
+    Все зарегистрированные объекты поворачиваются одним шагом `step`.
+    """
+
+    def __init__(self) -> None:
+        self._directions = array('d')
+        self._angle_speeds = array('d')
+
+    def __len__(self) -> int:
+        return len(self._directions)
+
+    def register(self, dirrection: Angle, angle_speed: Angle) -> 'BatchRotating':
+        """Добавить объект и получить адаптер к нему с интерфейсом Rotating."""
+        self._directions.append(dirrection.radians)
+        self._angle_speeds.append(angle_speed.radians)
+        return BatchRotating(self, len(self._directions) - 1)
+
+    def step(self) -> None:
+        """Повернуть все объекты на их угловую скорость."""
+        advance_angles(self._directions, self._angle_speeds)
+
+
+class BatchRotating(Rotating):
+    """Объект из BatchRotation, доступный через интерфейс Rotating."""
+
+    def __init__(self, rotation: BatchRotation, index: int) -> None:
+        self._rotation = rotation
+        self._index = index
+
+    def get_dirrection(self) -> Angle:
+        return Angle(self._rotation._directions[self._index])
+
+    def set_dirrection(self, dirrection: Angle) -> None:
+        self._rotation._directions[self._index] = dirrection.radians
+
+    def get_angle_speed(self) -> Angle:
+        return Angle(self._rotation._angle_speeds[self._index])
+
+    def set_angle_speed(self, angle_speed: Angle) -> None:
+        self._rotation._angle_speeds[self._index] = angle_speed.radians
+
+
+class BatchRotateCommand(Command):
+    """Команда, поворачивающая все объекты BatchRotation за один вызов."""
+
+    def __init__(self, rotation: BatchRotation) -> None:
+        self.rotation = rotation
+
+    def execute(self) -> None:
+        self.rotation.step()
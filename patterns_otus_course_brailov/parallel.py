@@ -0,0 +1,231 @@
+import collections
+import threading
+import typing
+
+from .command import Command, MacroCommand, MacroCommandError
+from .geometry.spatial import IndexedMovable
+from .movement.commands import MoveCommand, RotateCommand
+from .world import EntityView
+
+
+Key = typing.Hashable
+KeyFunction = typing.Callable[[Command], typing.Optional['Access']]
+
+
+class Access(typing.NamedTuple):
+    """Ключи объектов, которые команда читает и меняет."""
+
+    writes: frozenset
+    reads: frozenset = frozenset()
+
+
+class KeyedCommand(Command):
+    """Команда с явно объявленными ключами изменяемых и читаемых объектов."""
+
+    def __init__(self, command: Command, writes: typing.Iterable[Key], reads: typing.Iterable[Key] = ()) -> None:
+        self.command = command
+        self.access = Access(frozenset(writes), frozenset(reads))
+
+    def execute(self) -> typing.Any:
+        return self.command.execute()
+
+
+def object_key(target: typing.Any) -> Key:
+    """Ключ объекта: разные представления одного объекта мира дают один ключ."""
+    if isinstance(target, EntityView):
+        return id(target._world), target.id
+    if isinstance(target, IndexedMovable):
+        # все объекты одного индекса меняют общий индекс
+        return id(target.index)
+    return id(target)
+
+
+def command_access(command: Command) -> typing.Optional[Access]:
+    """Ключи, с которыми работает команда, или None, если они неизвестны."""
+    if isinstance(command, KeyedCommand):
+        return command.access
+    if isinstance(command, MoveCommand):
+        return Access(frozenset((object_key(command.movable),)))
+    if isinstance(command, RotateCommand):
+        return Access(frozenset((object_key(command.rotating),)))
+    if isinstance(command, MacroCommand):
+        writes: set[Key] = set()
+        reads: set[Key] = set()
+        for nested in command.commands:
+            access = command_access(nested)
+            if access is None:
+                return None
+            writes |= access.writes
+            reads |= access.reads
+        return Access(frozenset(writes), frozenset(reads))
+    return None
+
+
+def partition(commands: typing.Sequence[Command], keys: KeyFunction = command_access) -> list[list[Command]]:
+    """Разбить команды на независимые группы.
+
+    Команды, меняющие общий объект (или меняющие объект, который читает другая),
+    попадают в одну группу в исходном порядке. Объекты, которые только читаются,
+    команды не связывают. Если ключи хотя бы одной команды неизвестны, все команды
+    попадают в одну группу.
+    """
+    accesses = []
+    for command in commands:
+        access = keys(command)
+        if access is None:
+            return [list(commands)] if commands else []
+        accesses.append(access)
+
+    written = set()
+    for access in accesses:
+        written |= access.writes
+
+    parents = list(range(len(commands)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    owners: dict[Key, int] = {}
+    for index, access in enumerate(accesses):
+        for key in access.writes | (access.reads & written):
+            owner = owners.setdefault(key, index)
+            if owner != index:
+                parents[find(index)] = find(owner)
+
+    groups: dict[int, list[Command]] = {}
+    for index, command in enumerate(commands):
+        groups.setdefault(find(index), []).append(command)
+    return list(groups.values())
+
+
+class ParallelExecutor:
+    """Исполняет пачку команд в пуле потоков, разбив ее на независимые группы.
+
+    Группы раскладываются по очередям потоков; опустошив свою очередь, поток
+    забирает группы с другого конца чужих очередей (work stealing). Команды
+    одной группы исполняются по порядку одним потоком.
+
+    Из-за GIL ускорение дают только команды, отпускающие GIL (ввод-вывод,
+    хеширование, расширения на C); чисто питоновские команды исполняются
+    не быстрее, чем последовательно.
+    """
+
+    def __init__(self, workers: int = 4, keys: KeyFunction = command_access, name: str = 'parallel') -> None:
+        if workers < 1:
+            raise ValueError('workers must be positive.')
+        self._keys = keys
+        self._queues: list[typing.Deque[list[Command]]] = [collections.deque() for _ in range(workers)]
+        self._condition = threading.Condition()
+        self._run_lock = threading.Lock()
+        self._generation = 0
+        self._remaining = 0
+        self._errors: list[Exception] = []
+        self._closed = False
+        self._threads = [
+            threading.Thread(name=f'{name}-{index}', target=self._worker, args=(index,), daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> 'ParallelExecutor':
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.shutdown()
+
+    def execute(self, commands: typing.Iterable[Command]) -> None:
+        """Исполнить команды и дождаться завершения всех групп.
+
+        Ошибка команды не прерывает ее группу; все ошибки бросаются вместе в MacroCommandError.
+        """
+        groups = partition(list(commands), self._keys)
+        with self._run_lock:
+            if self._closed:
+                raise RuntimeError('Executor is shut down.')
+            if len(groups) == 1 or len(self._queues) == 1:
+                errors: list[Exception] = []
+                for group in groups:
+                    self._run_group(group, errors)
+            else:
+                errors = self._run_parallel(groups)
+        if errors:
+            raise MacroCommandError(errors)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _run_parallel(self, groups: list[list[Command]]) -> list[Exception]:
+        queues = self._queues
+        with self._condition:
+            # счетчик выставляется до раздачи: поток, еще не уснувший после прошлой
+            # пачки, может забрать новую группу раньше, чем увидит новое поколение
+            self._errors = []
+            self._remaining = len(groups)
+            # крупные группы раздаем первыми, чтобы очереди вышли примерно равными
+            for index, group in enumerate(sorted(groups, key=len, reverse=True)):
+                queues[index % len(queues)].append(group)
+            self._generation += 1
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._remaining == 0)
+            return self._errors
+
+    @staticmethod
+    def _run_group(group: list[Command], errors: list[Exception]) -> None:
+        for command in group:
+            try:
+                command.execute()
+            except Exception as error:
+                errors.append(error)
+
+    def _steal(self, index: int) -> typing.Optional[list[Command]]:
+        queues = self._queues
+        for offset in range(1, len(queues)):
+            try:
+                return queues[(index + offset) % len(queues)].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _worker(self, index: int) -> None:
+        own = self._queues[index]
+        generation = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or self._generation != generation)
+                if self._closed:
+                    return
+                generation = self._generation
+
+            while True:
+                try:
+                    group = own.pop()
+                except IndexError:
+                    group = self._steal(index)
+                    if group is None:
+                        break
+                errors: list[Exception] = []
+                self._run_group(group, errors)
+                with self._condition:
+                    self._errors.extend(errors)
+                    self._remaining -= 1
+                    if self._remaining == 0:
+                        self._condition.notify_all()
+
+
+class ParallelBatchCommand(Command):
+    """Команда, исполняющая пачку команд через ParallelExecutor (например, внутри Actor)."""
+
+    def __init__(self, executor: ParallelExecutor, commands: typing.Iterable[Command]) -> None:
+        self.executor = executor
+        self.commands = list(commands)
+
+    def execute(self) -> None:
+        self.executor.execute(self.commands)
@@ -0,0 +1,186 @@
+import collections
+import logging
+import threading
+import typing
+
+from .actors import bind_context
+from .command import Command
+
+
+class PooledActor:
+    """Легковесный актор без собственного потока.
+
+    Команды актора исполняются потоками `ActorPool` строго по очереди:
+    в каждый момент времени актор обслуживается не более чем одним потоком пула.
+    """
+
+    def __init__(self, pool: 'ActorPool', name: str):
+        self._pool = pool
+        self._name = name
+
+        self._mailbox: typing.Deque[Command] = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._hard_stop = False
+        self._soft_stop = False
+        self._stopped = threading.Event()
+
+        self._logger = logging.getLogger(name=f'{__name__}.actor.{name}')
+
+    def __repr__(self) -> str:
+        return f'<PooledActor: {self.name}>'
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def add_command(self, command: Command):
+        """Положить команду в очередь актору. (thread-safe)"""
+        with self._lock:
+            self._mailbox.append(command)
+            self._schedule_locked()
+
+    def add_commands(self, commands: typing.Iterable[Command]):
+        """Положить несколько команд в очередь актору. (thread-safe)"""
+        commands = list(commands)
+        with self._lock:
+            self._mailbox.extend(commands)
+            self._schedule_locked()
+
+    def hard_stop(self) -> None:
+        """Остановить актор не дожидаясь завершения исполнения имеющихся команд."""
+        with self._lock:
+            self._hard_stop = True
+            self._schedule_locked()
+
+    def soft_stop(self) -> None:
+        """Остановить актор после завершения исполнения имеющихся команд."""
+        with self._lock:
+            self._soft_stop = True
+            self._schedule_locked()
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        """Блокировать вызывающий поток до тех пор, пока не остановится актор."""
+        self._stopped.wait(timeout)
+
+    def is_stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def _schedule_locked(self) -> None:
+        if self._scheduled or self._stopped.is_set():
+            return
+        self._scheduled = True
+        self._pool._schedule(self)
+
+    def _safe_execute_command(self, command: Command):
+        try:
+            command.execute()
+        except Exception:
+            self._logger.exception('Error command execution.')
+
+    def _run(self, quantum: int) -> None:
+        """Исполнить не больше `quantum` команд и вернуть актор в очередь пула, если остались еще."""
+        with self._lock:
+            mailbox = self._mailbox
+            if self._hard_stop:
+                batch = []
+            elif quantum >= len(mailbox):
+                batch = list(mailbox)
+                mailbox.clear()
+            else:
+                batch = [mailbox.popleft() for _ in range(quantum)]
+
+        for command in batch:
+            if self._hard_stop:
+                break
+            self._safe_execute_command(command)
+
+        with self._lock:
+            if self._hard_stop or (self._soft_stop and not self._mailbox):
+                self._mailbox.clear()
+                self._scheduled = False
+                self._stopped.set()
+            elif self._mailbox:
+                self._pool._schedule(self)
+            else:
+                self._scheduled = False
+
+
+class ActorPool:
+    """Исполняет команды множества акторов на фиксированном наборе потоков.
+
+    Акторы с непустой очередью обслуживаются по кругу: за один подход актор
+    исполняет не больше `quantum` команд, поэтому один загруженный актор не может
+    надолго занять потоки пула.
+    """
+
+    def __init__(self, workers: int = 4, quantum: int = 64, name: str = 'actor-pool'):
+        """Конструктор пула.
+
+        :param workers: количество потоков пула
+        :param quantum: сколько команд актор исполняет за один подход
+        :param name: префикс имен потоков пула
+        """
+        if workers < 1:
+            raise ValueError('workers must be positive.')
+        if quantum < 1:
+            raise ValueError('quantum must be positive.')
+
+        self._quantum = quantum
+        self._name = name
+        self._run_queue: typing.Deque[PooledActor] = collections.deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._stop = False
+        self._actors_created = 0
+
+        self._threads = [
+            threading.Thread(name=f'{name}-{index}', target=self._worker_loop)
+            for index in range(workers)
+        ]
+
+    def __repr__(self) -> str:
+        return f'<ActorPool: {self._name}>'
+
+    def create_actor(self, name: typing.Optional[str] = None) -> PooledActor:
+        """Создать новый актор, исполняемый потоками пула."""
+        with self._condition:
+            self._actors_created += 1
+            number = self._actors_created
+        return PooledActor(self, name or f'{self._name}-actor-{number}')
+
+    def start(self) -> None:
+        """Запустить потоки пула."""
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Остановить потоки пула после того, как они закончат текущий подход."""
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        """Блокировать вызывающий поток до тех пор, пока не остановятся потоки пула."""
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def _schedule(self, actor: PooledActor) -> None:
+        with self._condition:
+            self._run_queue.append(actor)
+            self._condition.notify()
+
+    def _next_actor(self) -> typing.Optional[PooledActor]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._run_queue or self._stop)
+            if self._stop:
+                return None
+            return self._run_queue.popleft()
+
+    def _worker_loop(self) -> None:
+        while True:
+            actor = self._next_actor()
+            if actor is None:
+                break
+            with bind_context(actor):
+                actor._run(self._quantum)
@@ -0,0 +1,97 @@
+import concurrent.futures
+import os
+import threading
+import typing
+
+from .actors import set_context
+from .command import Command
+
+
+class WorkerContext:
+    """Контекст актора внутри процесса-исполнителя.
+
+    Доступен командам через `ActorCommand.actor_action` и `get_context`.
+    В `state` команды могут хранить данные между вызовами внутри процесса.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pid = os.getpid()
+        self.state: dict[str, typing.Any] = {}
+
+    def __repr__(self) -> str:
+        return f'<WorkerContext: {self.name} pid={self.pid}>'
+
+
+def _init_worker(name: str) -> None:
+    set_context(WorkerContext(name))
+
+
+def _execute(command: Command) -> typing.Any:
+    return command.execute()
+
+
+class ProcessActor:
+    """Исполняет команды в отдельном процессе, по одной и в порядке поступления.
+
+    Команды и результаты их исполнения передаются между процессами через pickle,
+    поэтому команды должны быть сериализуемыми (лямбды не подойдут).
+    """
+
+    def __init__(self, name: typing.Optional[str] = None):
+        """Конструктор актора.
+
+        :param name: имя для актора
+        """
+        self._name = name or f'ProcessActor-{id(self):x}'
+        self._executor: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._pending: set[concurrent.futures.Future] = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'<ProcessActor: {self.name}>'
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def start(self) -> None:
+        """Запустить процесс актора."""
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_init_worker,
+            initargs=(self._name,),
+        )
+
+    def add_command(self, command: Command) -> concurrent.futures.Future:
+        """Отправить команду в процесс актора. (thread-safe)
+
+        Возвращает Future с результатом `execute` или исключением, брошенным командой.
+        """
+        if self._executor is None:
+            raise RuntimeError(f'Actor "{self.name}" is not started.')
+        future = self._executor.submit(_execute, command)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def hard_stop(self) -> None:
+        """Остановить актор, отменив еще не начатые команды."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def soft_stop(self) -> None:
+        """Остановить актор после завершения исполнения имеющихся команд."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        """Блокировать вызывающий поток до тех пор, пока не будут исполнены отправленные команды."""
+        with self._lock:
+            pending = list(self._pending)
+        concurrent.futures.wait(pending, timeout)
+
+    def _forget(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
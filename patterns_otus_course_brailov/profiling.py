@@ -0,0 +1,171 @@
+"""Профилирование исполнения команд актора.
+
+Profiler раз в `1 / frequency` секунд снимает стек потока актора и складывает
+его в счетчики с корнем - классом исполняемой команды. Поток актора при этом
+ничего не делает, поэтому стоимость профилирования почти не зависит от
+количества команд. Стеки сохраняются в свернутом формате (collapsed stacks),
+который понимают flamegraph.pl, speedscope и inferno.
+
+Дополнительно Profiler может через ExecutionHook замерять время исполнения
+доли `sample_rate` команд; это уже стоит пару сотен наносекунд на каждую команду.
+"""
+import collections
+import os
+import random
+import sys
+import threading
+import time
+import types
+import typing
+
+from .actors import Actor, ExecutionHook
+from .command import Command
+
+
+# кадр, с которого начинается исполнение команды; все, что выше него, - цикл актора
+_EXECUTION_CODE = Actor._safe_execute_command.__code__
+
+
+def unwrap(command: Command) -> Command:
+    """Команда без оберток (метрик, журнала, future и т.п.), хранящих ее в атрибуте `command`."""
+    inner = getattr(command, 'command', None)
+    while isinstance(inner, Command):
+        command = inner
+        inner = getattr(command, 'command', None)
+    return command
+
+
+def frame_label(frame: types.FrameType) -> str:
+    """Место вызова: файл, функция (с классом, если известен) и строка."""
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', None)
+    if name is None:
+        # до Python 3.11 у кода нет полного имени - берем класс из self, если он есть
+        instance = frame.f_locals.get('self')
+        name = code.co_name if instance is None else f'{type(instance).__name__}.{code.co_name}'
+    return f'{os.path.basename(code.co_filename)}:{name}:{frame.f_lineno}'
+
+
+class CommandTiming:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return f'<CommandTiming: count={self.count} total={self.total:.6f}>'
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Profiler(ExecutionHook):
+    """Профилировщик команд актора."""
+
+    def __init__(
+        self,
+        frequency: float = 100.0,
+        sample_rate: float = 0.0,
+        clock: typing.Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Конструктор профилировщика.
+
+        :param frequency: сколько раз в секунду снимать стек потока актора, 0 - не снимать
+        :param sample_rate: доля команд, время исполнения которых замеряется, 0 - не замерять
+        :param clock: часы для замеров
+        """
+        if frequency < 0 or not 0 <= sample_rate <= 1:
+            raise ValueError('frequency must be non-negative and sample_rate must be in [0, 1].')
+        self._clock = clock
+        self._frequency = frequency
+        self._sample_rate = sample_rate
+        self._random = random.random
+        self._started_at: typing.Optional[float] = None
+
+        self.timings: dict[str, CommandTiming] = collections.defaultdict(CommandTiming)
+        self.stacks: typing.Counter[str] = collections.Counter()
+        self.samples = 0
+
+        self._actor: typing.Optional[Actor] = None
+        self._stop_event = threading.Event()
+        self._sampler: typing.Optional[threading.Thread] = None
+
+    def attach(self, actor: Actor) -> None:
+        """Начать профилировать актор."""
+        if self._actor is not None:
+            raise RuntimeError('Profiler is already attached.')
+        self._actor = actor
+        if self._sample_rate:
+            actor.add_hook(self)
+        if self._frequency:
+            self._stop_event.clear()
+            self._sampler = threading.Thread(name=f'{actor.name}-profiler', target=self._loop, daemon=True)
+            self._sampler.start()
+
+    def detach(self) -> None:
+        actor = self._actor
+        if actor is None:
+            return
+        actor.remove_hook(self)
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        self._actor = None
+
+    def before(self, command: Command) -> None:
+        if self._random() < self._sample_rate:
+            self._started_at = self._clock()
+
+    def after(self, command: Command, error: typing.Optional[Exception]) -> None:
+        started_at = self._started_at
+        if started_at is None:
+            return
+        self._started_at = None
+        duration = self._clock() - started_at
+        timing = self.timings[type(unwrap(command)).__name__]
+        timing.count += 1
+        timing.total += duration
+        if duration > timing.max:
+            timing.max = duration
+        if error is not None:
+            timing.errors += 1
+
+    def sample(self) -> None:
+        """Снять стек потока актора, если он сейчас исполняет команду."""
+        actor = self._actor
+        thread_ident = actor.thread_ident if actor is not None else None
+        if thread_ident is None:
+            return
+        frame = sys._current_frames().get(thread_ident)
+        labels = []
+        while frame is not None and frame.f_code is not _EXECUTION_CODE:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        if frame is None:
+            # актор ждет команды
+            return
+        command = frame.f_locals.get('command')
+        labels.append(type(unwrap(command)).__name__)
+        labels.reverse()
+        self.stacks[';'.join(labels)] += 1
+        self.samples += 1
+
+    def by_command(self) -> typing.Counter[str]:
+        """Количество снятых стеков по классам команд."""
+        counter: typing.Counter[str] = collections.Counter()
+        for stack, count in self.stacks.items():
+            counter[stack.split(';', 1)[0]] += count
+        return counter
+
+    def dump_collapsed(self, file: typing.TextIO) -> None:
+        """Записать стеки в свернутом формате: `кадр;кадр;... количество` на строку."""
+        for stack, count in sorted(self.stacks.items()):
+            file.write(f'{stack} {count}\n')
+
+    def _loop(self) -> None:
+        interval = 1 / self._frequency
+        while not self._stop_event.wait(interval):
+            self.sample()
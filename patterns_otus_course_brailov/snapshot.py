@@ -0,0 +1,203 @@
+"""Двоичные снимки и дельты состояния мира.
+
+Снимок - заголовок и колонки WorldState подряд: шесть колонок little-endian
+float64 и маска живых объектов по байту на ячейку. Дельта хранит только
+ячейки, изменившиеся с предыдущей дельты, в том же поколоночном виде.
+"""
+import mmap
+import os
+import struct
+import sys
+import typing
+from array import array
+
+from .world import WorldState
+
+
+COLUMNS = ('xs', 'ys', 'velocity_xs', 'velocity_ys', 'directions', 'angle_speeds')
+VERSION = 1
+
+SNAPSHOT_MAGIC = b'WSNP'
+DELTA_MAGIC = b'WDLT'
+
+# магия, версия, резерв, количество ячеек, номер тика
+SNAPSHOT_HEADER = struct.Struct('<4sHHQQ')
+# то же и количество изменившихся ячеек
+DELTA_HEADER = struct.Struct('<4sHHQQQ')
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+Buffer = typing.Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class SnapshotError(Exception):
+    """Буфер не является снимком (дельтой) поддерживаемой версии."""
+
+
+def _le_bytes(column: array) -> memoryview:
+    if _LITTLE_ENDIAN:
+        return memoryview(column).cast('B')
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return memoryview(swapped).cast('B')
+
+
+def _read_doubles(data: memoryview, offset: int, count: int) -> array:
+    column = array('d')
+    column.frombytes(data[offset:offset + count * 8])
+    if not _LITTLE_ENDIAN:
+        column.byteswap()
+    return column
+
+
+def _check_header(magic: bytes, version: int, expected: bytes) -> None:
+    if magic != expected:
+        raise SnapshotError(f'Bad magic {magic!r}, expected {expected!r}.')
+    if version != VERSION:
+        raise SnapshotError(f'Unsupported version {version}.')
+
+
+def snapshot_buffers(world: WorldState, tick: int = 0) -> list[memoryview]:
+    """Снимок мира в виде буферов для `file.writelines` или `socket.sendmsg`.
+
+    На little-endian платформах колонки не копируются: буферы смотрят прямо
+    в массивы мира, поэтому менять мир, пока они используются, нельзя.
+    """
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, 0, world.capacity, tick)
+    buffers = [memoryview(header)]
+    buffers.extend(_le_bytes(getattr(world, name)) for name in COLUMNS)
+    buffers.append(memoryview(world.alive))
+    return buffers
+
+
+def encode_snapshot(world: WorldState, tick: int = 0) -> bytes:
+    return b''.join(snapshot_buffers(world, tick))
+
+
+def decode_snapshot(data: Buffer) -> tuple[WorldState, int]:
+    """Восстановить мир из снимка. Возвращает мир и номер тика снимка."""
+    view = memoryview(data)
+    magic, version, _, capacity, tick = SNAPSHOT_HEADER.unpack_from(view)
+    _check_header(magic, version, SNAPSHOT_MAGIC)
+    size = SNAPSHOT_HEADER.size + capacity * (8 * len(COLUMNS) + 1)
+    if len(view) < size:
+        raise SnapshotError(f'Snapshot is truncated: {len(view)} of {size} bytes.')
+
+    world = WorldState()
+    offset = SNAPSHOT_HEADER.size
+    for name in COLUMNS:
+        setattr(world, name, _read_doubles(view, offset, capacity))
+        offset += capacity * 8
+    world.alive = bytearray(view[offset:offset + capacity])
+    world._reindex()
+    return world, tick
+
+
+def save_snapshot(world: WorldState, path: typing.Union[str, os.PathLike], tick: int = 0) -> None:
+    with open(path, 'wb') as file:
+        file.writelines(snapshot_buffers(world, tick))
+
+
+def load_snapshot(path: typing.Union[str, os.PathLike]) -> tuple[WorldState, int]:
+    """Загрузить снимок из файла через mmap, не читая файл в промежуточный буфер."""
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return decode_snapshot(mapped)
+
+
+class DeltaEncoder:
+    """Кодирует изменения мира между вызовами `encode`.
+
+    Хранит копию колонок на момент прошлой дельты. Колонки сравниваются
+    блоками по `block` ячеек, поэлементно просматриваются только
+    изменившиеся блоки. Ячейки сравниваются побайтно, поэтому NaN
+    не считается изменением.
+    """
+
+    def __init__(self, world: WorldState, block: int = 64) -> None:
+        if block < 1:
+            raise ValueError('block must be positive.')
+        self._world = world
+        self._block = block
+        self._base = self._copy_columns()
+        self._current = self._base
+
+    def _copy_columns(self) -> list[bytes]:
+        world = self._world
+        columns = [getattr(world, name).tobytes() for name in COLUMNS]
+        columns.append(bytes(world.alive))
+        return columns
+
+    def changed_ids(self) -> list[int]:
+        """Ячейки, изменившиеся с прошлой дельты (новые ячейки тоже считаются изменившимися)."""
+        world = self._world
+        capacity = world.capacity
+        common = min(capacity, len(self._base[-1]))
+
+        changed = set(range(common, capacity))
+        current_columns = self._copy_columns()
+        for current, base in zip(current_columns, self._base):
+            width = len(current) // capacity if capacity else 1
+            size = common * width
+            if current[:size] == base[:size]:
+                continue
+            # bytes сравниваются через memcmp; поэлементно смотрим только различающиеся блоки
+            step = self._block * width
+            for start in range(0, size, step):
+                end = min(start + step, size)
+                if current[start:end] == base[start:end]:
+                    continue
+                changed.update(
+                    offset // width
+                    for offset in range(start, end, width)
+                    if current[offset:offset + width] != base[offset:offset + width]
+                )
+        self._current = current_columns
+        return sorted(changed)
+
+    def encode(self, tick: int = 0) -> bytes:
+        """Дельта с прошлого вызова (или с создания кодировщика)."""
+        world = self._world
+        ids = self.changed_ids()
+        parts = [DELTA_HEADER.pack(DELTA_MAGIC, VERSION, 0, world.capacity, tick, len(ids))]
+        parts.append(_le_bytes(array('Q', ids)))
+        for name in COLUMNS:
+            column = getattr(world, name)
+            parts.append(_le_bytes(array('d', [column[index] for index in ids])))
+        alive = world.alive
+        parts.append(bytes(alive[index] for index in ids))
+        self._base = self._current
+        return b''.join(parts)
+
+
+def apply_delta(world: WorldState, data: Buffer) -> int:
+    """Применить дельту к миру. Возвращает номер тика дельты."""
+    view = memoryview(data)
+    magic, version, _, capacity, tick, count = DELTA_HEADER.unpack_from(view)
+    _check_header(magic, version, DELTA_MAGIC)
+    size = DELTA_HEADER.size + count * (8 + 8 * len(COLUMNS) + 1)
+    if len(view) < size:
+        raise SnapshotError(f'Delta is truncated: {len(view)} of {size} bytes.')
+
+    grow = capacity - world.capacity
+    if grow > 0:
+        zeros = array('d', bytes(grow * 8))
+        for name in COLUMNS:
+            getattr(world, name).extend(zeros)
+        world.alive.extend(bytes(grow))
+
+    offset = DELTA_HEADER.size
+    ids = array('Q')
+    ids.frombytes(view[offset:offset + count * 8])
+    if not _LITTLE_ENDIAN:
+        ids.byteswap()
+    offset += count * 8
+    for name in COLUMNS:
+        column = getattr(world, name)
+        for index, value in zip(ids, _read_doubles(view, offset, count)):
+            column[index] = value
+        offset += count * 8
+    alive = world.alive
+    for index, value in zip(ids, view[offset:offset + count]):
+        alive[index] = value
+    world._reindex()
+    return tick
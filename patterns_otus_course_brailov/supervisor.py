@@ -0,0 +1,248 @@
+import concurrent.futures
+import logging
+import threading
+import time
+import typing
+
+from .actors import Actor
+from .command import Command
+from .mailbox import Lane
+
+
+class Supervisor:
+    """Следит за актором и перезапускает его, если он завис или упал.
+
+    Актор считается зависшим, если одна команда исполняется дольше `hang_timeout`
+    (см. `Actor.heartbeat`), и упавшим, если его поток завершился без остановки.
+    Новый актор создается через `factory` и получает все неисполненные команды
+    старого, поэтому отправлять команды стоит через супервизор, а не напрямую актору.
+    Если перезапуски идут подряд, каждый следующий откладывается на время,
+    растущее от `backoff_initial` в `backoff_factor` раз, но не больше `backoff_max`.
+    Новый актор во время задержки уже принимает команды, а запускает его сторожевой
+    поток, поэтому `restart` и `drain` задержку не ждут.
+
+    Зависшую команду прервать нельзя: поток старого актора остановится, когда она
+    завершится. Остаток его текущей пачки новый актор получает первым, а команды,
+    которые придут старому во время перезапуска, супервизор перекладывает новому
+    актору на следующих проверках.
+    """
+
+    def __init__(
+        self,
+        factory: typing.Callable[[], Actor],
+        hang_timeout: float = 5.0,
+        check_interval: float = 0.5,
+        backoff_initial: float = 0.1,
+        backoff_max: float = 10.0,
+        backoff_factor: float = 2.0,
+        backoff_reset: float = 60.0,
+    ) -> None:
+        """Конструктор супервизора.
+
+        :param factory: создает новый (не запущенный) актор
+        :param hang_timeout: сколько секунд может исполняться одна команда
+        :param check_interval: как часто проверять актор
+        :param backoff_reset: через сколько секунд без перезапусков задержка сбрасывается
+        """
+        if hang_timeout <= 0 or check_interval <= 0:
+            raise ValueError('hang_timeout and check_interval must be positive.')
+
+        self._factory = factory
+        self._hang_timeout = hang_timeout
+        self._check_interval = check_interval
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+        self._backoff_factor = backoff_factor
+        self._backoff_reset = backoff_reset
+
+        self._actor = factory()
+        self._retired: list[Actor] = []
+        # когда запустить актор, отложенный задержкой перезапуска; None - актор запущен
+        self._start_at: typing.Optional[float] = None
+        self._lock = threading.Lock()
+        # отправка команд и смена актора: команда не должна попасть старому актору после его drain
+        self._send_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watchdog = threading.Thread(name=f'{self._actor.name}-watchdog', target=self._loop, daemon=True)
+
+        self._restarts = 0
+        self._failures = 0
+        self._last_restart_at = 0.0
+
+        self._logger = logging.getLogger(name=f'{__name__}.supervisor.{self._actor.name}')
+
+    def __repr__(self) -> str:
+        return f'<Supervisor: {self._actor.name}>'
+
+    @property
+    def actor(self) -> Actor:
+        """Текущий актор."""
+        return self._actor
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    def add_command(self, command: Command, lane: Lane = Lane.SIMULATION) -> bool:
+        """Положить команду в очередь текущему актору. (thread-safe)"""
+        with self._send_lock:
+            return self._actor.add_command(command, lane)
+
+    def add_commands(self, commands: typing.Iterable[Command], lane: Lane = Lane.SIMULATION) -> int:
+        with self._send_lock:
+            return self._actor.add_commands(commands, lane)
+
+    def submit(self, command: Command, lane: Lane = Lane.SIMULATION) -> concurrent.futures.Future:
+        with self._send_lock:
+            return self._actor.submit(command, lane)
+
+    def start(self) -> None:
+        """Запустить актор и сторожевой поток."""
+        self._actor.start()
+        self._watchdog.start()
+
+    def restart(self) -> None:
+        """Заменить актор новым, переложив ему неисполненные команды. (thread-safe)
+
+        Команде, которую старый актор исполняет в этот момент, дается до `check_interval`
+        секунд на завершение, чтобы новый актор не начал исполнять следующие раньше нее.
+        """
+        with self._lock:
+            self._replace(self._factory(), self._check_interval)
+
+    def drain(self, timeout: float, replacement: typing.Optional[Actor] = None) -> list[tuple[Lane, Command]]:
+        """Остановить актор, дав ему `timeout` секунд на исполнение очереди.
+
+        Если за это время очередь не опустела, актор останавливается жестко, а
+        неисполненные команды (с их полосами) передаются `replacement`, который
+        дальше работает под присмотром супервизора, или, если замены нет,
+        возвращаются вызывающему, и супервизор останавливается.
+        Команда, исполняемая в момент жесткой остановки, не прерывается.
+        """
+        if replacement is None:
+            # останавливает сторожевой поток, чтобы он больше не перезапускал актор
+            self._stop_event.set()
+        with self._lock:
+            # актор, ждущий конца задержки перезапуска, еще не запущен и просто отдает очередь
+            self._start_at = None
+            if replacement is not None:
+                old = self._actor
+                # новые команды копятся у замены, пока старый актор дорабатывает очередь
+                self._switch_to(replacement)
+                self._stop_actor(old, timeout)
+                replacement.mailbox.put_front(old.drain())
+                replacement.start()
+                self._retire(old)
+                return []
+
+            self._stop_actor(self._actor, timeout)
+            pending = self._actor.drain()
+            for actor in self._retired:
+                pending.extend(actor.drain())
+            self._retired.clear()
+        if self._watchdog.is_alive() and self._watchdog is not threading.current_thread():
+            self._watchdog.join()
+        return pending
+
+    def _stop_actor(self, actor: Actor, timeout: float) -> None:
+        actor.soft_stop()
+        actor.join(timeout)
+        if actor.is_alive():
+            actor.hard_stop(cancel_pending=False)
+            # дать исполняемой команде завершиться, если она завершится быстро
+            actor.join(min(timeout, self._check_interval))
+
+    def _retire(self, actor: Actor) -> None:
+        # даже остановленный актор забывается только после drain на следующей проверке:
+        # отправитель мог получить его до смены актора
+        self._retired.append(actor)
+
+    def _switch_to(self, replacement: Actor, pending: typing.Optional[list[tuple[Lane, Command]]] = None) -> None:
+        """Сделать `replacement` текущим актором.
+
+        Отправитель держит `_send_lock`, пока ждет места в очереди старого актора. Если передан
+        `pending`, старый актор уже не исполняет команды, и место освобождается, забирая его очередь в `pending`.
+        """
+        old = self._actor
+        while not self._send_lock.acquire(timeout=self._check_interval):
+            if pending is not None:
+                pending.extend(old.drain())
+        try:
+            self._actor = replacement
+        finally:
+            self._send_lock.release()
+
+    def _replace(self, replacement: Actor, join_timeout: float = 0.0) -> None:
+        old = self._actor
+        old.hard_stop(cancel_pending=False)
+        pending: list[tuple[Lane, Command]] = []
+        self._switch_to(replacement, pending)
+        if join_timeout:
+            old.join(join_timeout)
+        pending.extend(old.drain())
+        replacement.mailbox.put_front(pending)
+        self._retire(old)
+
+        now = time.monotonic()
+        if now - self._last_restart_at > self._backoff_reset:
+            self._failures = 0
+        delay = 0.0
+        if self._failures:
+            delay = min(self._backoff_initial * self._backoff_factor ** (self._failures - 1), self._backoff_max)
+        self._failures += 1
+        self._restarts += 1
+        self._last_restart_at = now
+        if delay:
+            # пока идет задержка, команды копятся в очереди нового актора; запустит его `_check`
+            self._start_at = now + delay
+        else:
+            self._start_at = None
+            replacement.start()
+
+    def _sweep_retired(self) -> None:
+        mailbox = self._actor.mailbox
+        for old in list(self._retired):
+            # проверяется до drain: все, что актор успел взять или получить до смерти, заберет этот drain
+            alive = old.is_alive()
+            # команды уже были приняты очередью, поэтому перекладываются без проверки емкости
+            mailbox.put_back(old.drain())
+            if not alive:
+                self._retired.remove(old)
+
+    def _check(self) -> None:
+        with self._lock:
+            if self._stop_event.is_set():
+                return
+            self._sweep_retired()
+            actor = self._actor
+            if self._start_at is not None:
+                if time.monotonic() < self._start_at:
+                    return
+                self._start_at = None
+                actor.start()
+                return
+            heartbeat = actor.heartbeat
+            if not actor.is_alive() and actor.stop_requested():
+                # актор остановили командой - присматривать больше не за кем
+                self._stop_event.set()
+                return
+            if not actor.is_alive():
+                self._logger.error('Actor %s has died, restarting.', actor.name)
+            elif heartbeat is not None and time.monotonic() - heartbeat > self._hang_timeout:
+                self._logger.error('Actor %s hangs for more than %s seconds, restarting.', actor.name, self._hang_timeout)
+            else:
+                return
+            self._replace(self._factory())
+
+    def _wait_interval(self) -> float:
+        start_at = self._start_at
+        if start_at is None:
+            return self._check_interval
+        return max(min(start_at - time.monotonic(), self._check_interval), 0)
+
+    def _loop(self) -> None:
+        while not self._stop_event.wait(self._wait_interval()):
+            try:
+                self._check()
+            except Exception:
+                self._logger.exception('Error checking actor %s.', self._actor.name)
@@ -0,0 +1,185 @@
+import collections
+import enum
+import logging
+import math
+import threading
+import time
+import typing
+
+from .actors import Actor
+from .command import Command
+
+
+class CatchUpPolicy(enum.Enum):
+    """Что делать с тиками, пропущенными из-за перегрузки."""
+
+    SKIP = 'skip'
+    """пропустить их и не отправлять новый тик, пока не исполнен предыдущий"""
+
+    CATCH_UP = 'catch_up'
+    """отправить их подряд (не больше `max_catch_up` за раз)"""
+
+
+def percentile(values: typing.Sequence[float], percent: float) -> typing.Optional[float]:
+    """Процентиль по методу ближайшего ранга."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class TickStats:
+    """Статистика тиков за последние `history` тиков."""
+
+    def __init__(self, history: int = 1000) -> None:
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.durations: typing.Deque[float] = collections.deque(maxlen=history)
+        self.queue_depths: typing.Deque[int] = collections.deque(maxlen=history)
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        durations = list(self.durations)
+        depths = list(self.queue_depths)
+        return {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'duration_p50': percentile(durations, 50),
+            'duration_p99': percentile(durations, 99),
+            'queue_depth_p50': percentile(depths, 50),
+            'queue_depth_max': max(depths, default=None),
+        }
+
+
+class _TickEnd(Command):
+    """Служебная отметка конца тика, исполняется после команд тика."""
+
+    def __init__(self, stats: TickStats) -> None:
+        self.stats = stats
+        self.sent_at = time.perf_counter()
+        self.done = False
+
+    def execute(self) -> None:
+        self.stats.durations.append(time.perf_counter() - self.sent_at)
+        self.done = True
+
+
+class TickScheduler:
+    """С фиксированной частотой отправляет актору повторяющиеся команды.
+
+    Длительность тика - время от отправки команд тика до исполнения последней из них.
+    Если к началу очередного тика предыдущий еще не исполнен, тик считается перегруженным.
+    """
+
+    def __init__(
+        self,
+        actor: Actor,
+        interval: float,
+        policy: CatchUpPolicy = CatchUpPolicy.SKIP,
+        max_catch_up: int = 5,
+        history: int = 1000,
+    ) -> None:
+        """Конструктор планировщика.
+
+        :param actor: актор, исполняющий команды тиков
+        :param interval: длительность тика в секундах
+        :param policy: что делать с пропущенными тиками
+        :param max_catch_up: сколько тиков подряд можно отправить при CatchUpPolicy.CATCH_UP
+        :param history: по скольким последним тикам считать статистику
+        """
+        if interval <= 0:
+            raise ValueError('interval must be positive.')
+        if max_catch_up < 1:
+            raise ValueError('max_catch_up must be positive.')
+
+        self._actor = actor
+        self._interval = interval
+        self._policy = policy
+        self._max_catch_up = max_catch_up
+
+        self._commands: list[Command] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(name=f'{actor.name}-ticks', target=self._loop)
+
+        self._stats = TickStats(history)
+        # отметка конца последнего отправленного тика
+        self._last_tick: typing.Optional[_TickEnd] = None
+        actor.mailbox.add_evict_listener(self._on_evicted)
+
+        self._logger = logging.getLogger(name=f'{__name__}.ticks.{actor.name}')
+
+    @property
+    def stats(self) -> TickStats:
+        return self._stats
+
+    def add_recurring(self, command: Command) -> None:
+        """Исполнять команду на каждом тике.
+
+        Если у актора есть журнал, команда должна быть в нем зарегистрирована, иначе - JournalError.
+        """
+        journal = self._actor.journal
+        if journal is not None:
+            journal.wrap(command)
+        with self._lock:
+            self._commands.append(command)
+
+    def remove_recurring(self, command: Command) -> None:
+        with self._lock:
+            self._commands.remove(command)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def join(self, timeout: typing.Optional[float] = None) -> None:
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _send_tick(self) -> None:
+        with self._lock:
+            commands = list(self._commands)
+        stats = self._stats
+        stats.ticks += 1
+        stats.queue_depths.append(len(self._actor.mailbox))
+        tick = _TickEnd(stats)
+
+        self._actor.add_commands(commands)
+        # отметка кладется в очередь напрямую: в журнал она не пишется, потому что не меняет мир
+        if not self._actor.mailbox.put(tick):
+            # очередь отбросила отметку - иначе тик навсегда остался бы незавершенным
+            tick.done = True
+        self._last_tick = tick
+
+    @staticmethod
+    def _on_evicted(command: Command) -> None:
+        if isinstance(command, _TickEnd):
+            command.done = True
+
+    def _loop(self) -> None:
+        interval = self._interval
+        next_tick = time.monotonic()
+        stats = self._stats
+        while not self._stop_event.wait(max(next_tick - time.monotonic(), 0)):
+            overrun = self._last_tick is not None and not self._last_tick.done
+            if overrun:
+                stats.overruns += 1
+
+            missed = max(int((time.monotonic() - next_tick) // interval), 0)
+            next_tick += missed * interval
+            if self._policy is CatchUpPolicy.CATCH_UP:
+                ticks = min(missed + 1, self._max_catch_up)
+            else:
+                ticks = 0 if overrun else 1
+            stats.skipped += missed + 1 - ticks
+
+            try:
+                for _ in range(ticks):
+                    self._send_tick()
+            except Exception:
+                self._logger.exception('Error sending tick.')
+            next_tick += interval
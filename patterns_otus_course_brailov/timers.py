@@ -0,0 +1,79 @@
+import heapq
+import itertools
+import threading
+import typing
+
+from .command import Command
+
+
+class TimerHandle:
+    """Отложенная (или периодическая) команда, которую можно отменить."""
+
+    def __init__(self, command: Command, deadline: float, interval: typing.Optional[float] = None) -> None:
+        self.command = command
+        self.deadline = deadline
+        self.interval = interval
+        self._cancelled = False
+
+    def __repr__(self) -> str:
+        return f'<TimerHandle: {self.command!r} at {self.deadline}>'
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Отменить команду. Уже начатое исполнение не прерывается."""
+        self._cancelled = True
+
+
+class TimerQueue:
+    """Куча таймеров, упорядоченных по времени срабатывания. (thread-safe)
+
+    Отмененные таймеры не удаляются из кучи сразу, а пропускаются при извлечении.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, handle: TimerHandle) -> bool:
+        """Добавить таймер. Возвращает True, если он сработает раньше всех остальных."""
+        with self._lock:
+            heap = self._heap
+            earliest = not heap or handle.deadline < heap[0][0]
+            heapq.heappush(heap, (handle.deadline, next(self._sequence), handle))
+            return earliest
+
+    def pop_due(self, now: float) -> list[TimerHandle]:
+        """Извлечь все неотмененные таймеры со временем срабатывания не позже `now`."""
+        due = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, _, handle = heapq.heappop(heap)
+                if not handle.cancelled:
+                    due.append(handle)
+        return due
+
+    def next_deadline(self) -> typing.Optional[float]:
+        """Время срабатывания ближайшего неотмененного таймера."""
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][2].cancelled:
+                heapq.heappop(heap)
+            return heap[0][0] if heap else None
+
+    def reschedule(self, handle: TimerHandle, now: float) -> None:
+        """Поставить периодический таймер на следующее срабатывание.
+
+        Если исполнение отстало больше чем на период, пропущенные срабатывания не догоняются.
+        """
+        handle.deadline += handle.interval
+        if handle.deadline < now:
+            handle.deadline = now + handle.interval
+        self.push(handle)
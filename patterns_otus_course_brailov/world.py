@@ -0,0 +1,171 @@
+import typing
+from array import array
+
+from .command import Command
+from .geometry.angles import Angle
+from .geometry.vectors import Vector
+from .movement.batch import advance, advance_angles
+from .movement.interfaces import Movable, Rotating
+
+
+class WorldState:
+    """Состояние всех объектов мира в колонках-массивах.
+
+    Позиция, скорость, направление и угловая скорость объекта хранятся
+    в отдельных array('d') по индексу-идентификатору объекта. Идентификаторы
+    удаленных объектов переиспользуются. У пустых ячеек нулевые скорости,
+    поэтому общие шаги движения и поворота их не меняют.
+    """
+
+    def __init__(self) -> None:
+        self.xs = array('d')
+        self.ys = array('d')
+        self.velocity_xs = array('d')
+        self.velocity_ys = array('d')
+        self.directions = array('d')
+        self.angle_speeds = array('d')
+        self.alive = bytearray()
+
+        self._free_ids: list[int] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Количество ячеек в колонках, включая пустые."""
+        return len(self.alive)
+
+    def add(
+        self,
+        position: Vector = Vector(0, 0),
+        velocity: Vector = Vector(0, 0),
+        dirrection: Angle = Angle(0),
+        angle_speed: Angle = Angle(0),
+    ) -> int:
+        """Добавить объект и вернуть его идентификатор."""
+        if self._free_ids:
+            entity_id = self._free_ids.pop()
+            self.xs[entity_id] = position.x
+            self.ys[entity_id] = position.y
+            self.velocity_xs[entity_id] = velocity.x
+            self.velocity_ys[entity_id] = velocity.y
+            self.directions[entity_id] = dirrection.radians
+            self.angle_speeds[entity_id] = angle_speed.radians
+            self.alive[entity_id] = 1
+        else:
+            entity_id = len(self.alive)
+            self.xs.append(position.x)
+            self.ys.append(position.y)
+            self.velocity_xs.append(velocity.x)
+            self.velocity_ys.append(velocity.y)
+            self.directions.append(dirrection.radians)
+            self.angle_speeds.append(angle_speed.radians)
+            self.alive.append(1)
+        self._count += 1
+        return entity_id
+
+    def remove(self, entity_id: int) -> None:
+        """Удалить объект. Его идентификатор может достаться следующему объекту."""
+        if not self.is_alive(entity_id):
+            raise KeyError(entity_id)
+        self.alive[entity_id] = 0
+        self.velocity_xs[entity_id] = 0.0
+        self.velocity_ys[entity_id] = 0.0
+        self.angle_speeds[entity_id] = 0.0
+        self._free_ids.append(entity_id)
+        self._count -= 1
+
+    def _reindex(self) -> None:
+        """Пересчитать свободные идентификаторы после прямой записи в колонки."""
+        alive = self.alive
+        self._free_ids = [entity_id for entity_id in range(len(alive) - 1, -1, -1) if not alive[entity_id]]
+        self._count = len(alive) - len(self._free_ids)
+
+    def is_alive(self, entity_id: int) -> bool:
+        return 0 <= entity_id < len(self.alive) and bool(self.alive[entity_id])
+
+    def ids(self) -> typing.Iterator[int]:
+        """Идентификаторы всех объектов мира."""
+        return (entity_id for entity_id, alive in enumerate(self.alive) if alive)
+
+    def view(self, entity_id: int) -> 'EntityView':
+        """Получить объект с интерфейсами Movable и Rotating."""
+        if not self.is_alive(entity_id):
+            raise KeyError(entity_id)
+        return EntityView(self, entity_id)
+
+    def move_all(self) -> None:
+        """Сдвинуть все объекты на их скорость."""
+        advance(self.xs, self.velocity_xs)
+        advance(self.ys, self.velocity_ys)
+
+    def rotate_all(self) -> None:
+        """Повернуть все объекты на их угловую скорость."""
+        advance_angles(self.directions, self.angle_speeds)
+
+
+class EntityView(Movable, Rotating):
+    """Объект из WorldState, доступный через интерфейсы Movable и Rotating.
+
+    Не хранит данных: все чтения и записи идут в колонки WorldState.
+    После удаления объекта его представлением пользоваться нельзя.
+    """
+
+    def __init__(self, world: WorldState, entity_id: int) -> None:
+        self._world = world
+        self.id = entity_id
+
+    def __repr__(self) -> str:
+        return f'<EntityView: {self.id}>'
+
+    def get_position(self) -> Vector:
+        world, entity_id = self._world, self.id
+        return Vector(world.xs[entity_id], world.ys[entity_id])
+
+    def set_position(self, position: Vector) -> None:
+        world, entity_id = self._world, self.id
+        world.xs[entity_id] = position.x
+        world.ys[entity_id] = position.y
+
+    def get_velocity(self) -> Vector:
+        world, entity_id = self._world, self.id
+        return Vector(world.velocity_xs[entity_id], world.velocity_ys[entity_id])
+
+    def set_velocity(self, velocity: Vector) -> None:
+        world, entity_id = self._world, self.id
+        world.velocity_xs[entity_id] = velocity.x
+        world.velocity_ys[entity_id] = velocity.y
+
+    def get_dirrection(self) -> Angle:
+        return Angle(self._world.directions[self.id])
+
+    def set_dirrection(self, dirrection: Angle) -> None:
+        self._world.directions[self.id] = dirrection.radians
+
+    def get_angle_speed(self) -> Angle:
+        return Angle(self._world.angle_speeds[self.id])
+
+    def set_angle_speed(self, angle_speed: Angle) -> None:
+        self._world.angle_speeds[self.id] = angle_speed.radians
+
+
+class MoveAllCommand(Command):
+    """Команда, двигающая все объекты мира за один вызов."""
+
+    def __init__(self, world: WorldState) -> None:
+        self.world = world
+
+    def execute(self) -> None:
+        self.world.move_all()
+
+
+class RotateAllCommand(Command):
+    """Команда, поворачивающая все объекты мира за один вызов."""
+
+    def __init__(self, world: WorldState) -> None:
+        self.world = world
+
+    def execute(self) -> None:
+        self.world.rotate_all()
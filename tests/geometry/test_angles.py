@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from patterns_otus_course_brailov.geometry import angles
+
+
+@pytest.mark.parametrize('radians, expected', [
+    (0, 0),
+    (math.pi, -math.pi),
+    (-math.pi, -math.pi),
+    (7, 7 - 2*math.pi),
+    (-7.5, -7.5 + 2*math.pi),
+    (3*math.pi, -math.pi),
+    (100, 100 - 32*math.pi),
+])
+def test_angle_normalization(radians, expected):
+    """Проверяет что угол приводится к полуинтервалу [-pi, pi)."""
+
+    assert angles.Angle(radians).radians == pytest.approx(expected)
+
+
+def test_degrees_normalization():
+    assert angles.radians_to_degrees(3*math.pi) == pytest.approx(-180)
+
+
+def test_angle_is_compact():
+    """Проверяет что у угла нет __dict__, а тригонометрия считается верно."""
+
+    angle = angles.from_degrees(60)
+
+    assert not hasattr(angle, '__dict__')
+    assert angle.cos == pytest.approx(0.5)
+    assert angle.sin == pytest.approx(math.sqrt(3) / 2)
+    assert angle.degrees == pytest.approx(60)
+
+
+def test_common_headings_are_interned():
+    assert angles.from_degrees(90) is angles.from_degrees(90)
+    assert angles.from_degrees(270).radians == pytest.approx(-math.pi / 2)
+    assert angles.from_degrees(45) is not angles.from_degrees(45)
+
+
+@pytest.mark.parametrize('radians', [math.nan, math.inf, -math.inf])
+def test_non_finite_angle_is_nan(radians):
+    """Проверяет что бесконечность и NaN дают угол NaN, а не исключение."""
+
+    assert math.isnan(angles.Angle(radians).radians)
+    assert math.isnan(angles.normalize(radians, period=360))
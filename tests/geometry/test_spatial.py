@@ -0,0 +1,67 @@
+import random
+
+from patterns_otus_course_brailov.geometry.spatial import IndexedMovable, UniformGrid
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.movement.commands import MoveCommand
+from patterns_otus_course_brailov.world import WorldState
+
+
+def random_points(count: int) -> dict[int, Vector]:
+    random.seed(0)
+    return {
+        key: Vector(random.uniform(-50, 50), random.uniform(-50, 50))
+        for key in range(count)
+    }
+
+
+def test_queries_match_brute_force():
+    """Проверяет что запросы к индексу совпадают с полным перебором."""
+
+    points = random_points(500)
+    index = UniformGrid(cell_size=7)
+    index.insert_many(points.items())
+
+    center, radius = Vector(3, -4), 12
+    assert sorted(index.query_radius(center, radius)) == sorted(
+        key for key, point in points.items() if (point - center).dist <= radius
+    )
+
+    lower, upper = Vector(-10, -20), Vector(15, 5)
+    assert sorted(index.query_rect(lower, upper)) == sorted(
+        key for key, point in points.items()
+        if lower.x <= point.x <= upper.x and lower.y <= point.y <= upper.y
+    )
+
+    distance = 3
+    pairs = {tuple(sorted(pair)) for pair in index.pairs_within(distance)}
+    assert len(pairs) == len(index.pairs_within(distance)), 'Пары повторяются'
+    assert pairs == {
+        (first, second)
+        for first in points
+        for second in points
+        if first < second and (points[first] - points[second]).dist <= distance
+    }
+
+
+def test_remove():
+    index = UniformGrid(cell_size=1)
+    index.insert('tank', Vector(0.5, 0.5))
+    index.remove('tank')
+
+    assert 'tank' not in index
+    assert index.query_radius(Vector(0, 0), 10) == []
+
+
+def test_index_follows_move_command():
+    """Проверяет что индекс обновляется, когда объект двигает MoveCommand."""
+
+    world = WorldState()
+    entity_id = world.add(position=Vector(0, 0), velocity=Vector(10, 0))
+    index = UniformGrid(cell_size=4)
+    tank = IndexedMovable(world.view(entity_id), index, entity_id)
+
+    MoveCommand(tank).execute()
+
+    assert index.position(entity_id) == Vector(10, 0)
+    assert index.query_radius(Vector(0, 0), 1) == []
+    assert index.query_radius(Vector(10, 0), 1) == [entity_id]
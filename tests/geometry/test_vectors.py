@@ -0,0 +1,36 @@
+import math
+from array import array
+
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.geometry.vectors import Rotation, Vector, roughly_equal
+
+
+def rotate_through_polar(vector: Vector, angle: angles.Angle) -> Vector:
+    """Поворот через полярные координаты, как было раньше."""
+    return Vector.from_polar(angle=vector.angle + angle, dist=vector.dist)
+
+
+def test_rotate():
+    assert roughly_equal(Vector(1, 0).rotate(angles.from_degrees(90)), Vector(0, 1))
+    assert roughly_equal(Vector(0, 2).rotate(angles.from_degrees(-90)), Vector(2, 0))
+    assert Vector(0, 0).rotate(angles.from_degrees(30)) == Vector(0, 0)
+
+
+def test_rotation_matches_polar_rotation():
+    """Проверяет что прямой поворот совпадает с поворотом через полярные координаты."""
+
+    vectors = [Vector(math.cos(i), math.sin(i)) * (i % 5 + 1) for i in range(100)]
+    rotation = Rotation(angles.from_degrees(37))
+
+    for vector, rotated in zip(vectors, rotation.apply_many(vectors)):
+        assert roughly_equal(rotated, rotate_through_polar(vector, rotation.angle), precision=1e-14)
+
+
+def test_rotate_arrays():
+    xs = array('d', [1, 0, -3])
+    ys = array('d', [0, 1, 0])
+
+    Rotation(angles.from_degrees(90)).apply_arrays(xs, ys)
+
+    for x, y, expected in zip(xs, ys, [Vector(0, 1), Vector(-1, 0), Vector(0, -3)]):
+        assert roughly_equal(Vector(x, y), expected)
@@ -0,0 +1,33 @@
+from patterns_otus_course_brailov.movement.batch import BatchMoveCommand, BatchMovement
+from patterns_otus_course_brailov.movement.commands import MoveCommand
+from patterns_otus_course_brailov.geometry.vectors import Vector, roughly_equal
+
+
+def test_batch_move():
+    """Проверяет что один шаг двигает все объекты на их скорость."""
+
+    movement = BatchMovement()
+    tanks = [
+        movement.register(position=Vector(i, -i), velocity=Vector(0.5, i))
+        for i in range(10)
+    ]
+
+    BatchMoveCommand(movement).execute()
+
+    for i, tank in enumerate(tanks):
+        assert roughly_equal(tank.get_position(), Vector(i + 0.5, 0))
+
+
+def test_batch_movable_works_with_move_command():
+    """Проверяет что объект из BatchMovement можно двигать обычной MoveCommand."""
+
+    movement = BatchMovement()
+    tank = movement.register(position=Vector(12, 5), velocity=Vector(-7, 3))
+    other = movement.register(position=Vector(0, 0), velocity=Vector(1, 1))
+
+    MoveCommand(tank).execute()
+    tank.set_velocity(Vector(1, 0))
+    movement.step()
+
+    assert roughly_equal(tank.get_position(), Vector(6, 8))
+    assert roughly_equal(other.get_position(), Vector(1, 1))
@@ -0,0 +1,38 @@
+import random
+
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.movement.batch import BatchRotateCommand, BatchRotation
+from patterns_otus_course_brailov.movement.commands import RotateCommand
+
+
+def test_batch_rotation_matches_angle_normalization():
+    """Проверяет что пакетный поворот дает в точности те же углы, что и сложение Angle."""
+
+    random.seed(0)
+    pairs = [
+        (angles.Angle(random.uniform(-10, 10)), angles.Angle(random.uniform(-10, 10)))
+        for _ in range(1000)
+    ]
+    pairs.append((angles.from_degrees(179), angles.from_degrees(1)))
+    pairs.append((angles.from_degrees(-180), angles.from_degrees(-1)))
+
+    rotation = BatchRotation()
+    objects = [rotation.register(dirrection, speed) for dirrection, speed in pairs]
+
+    for _ in range(3):
+        BatchRotateCommand(rotation).execute()
+
+    for (dirrection, speed), rotating in zip(pairs, objects):
+        expected = dirrection + speed + speed + speed
+        assert rotating.get_dirrection().radians == expected.radians
+
+
+def test_batch_rotating_works_with_rotate_command():
+    """Проверяет что объект из BatchRotation можно поворачивать обычной RotateCommand."""
+
+    rotation = BatchRotation()
+    rotating = rotation.register(angles.from_degrees(90), angles.from_degrees(1))
+
+    RotateCommand(rotating).execute()
+
+    assert angles.roughly_equal(rotating.get_dirrection(), angles.from_degrees(91))
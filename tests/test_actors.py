@@ -1,11 +1,23 @@
+import asyncio
 import threading
 import time
 import typing
 from unittest.mock import Mock
 from contextlib import contextmanager
 
+import pytest
+
 from patterns_otus_course_brailov.command import Command, CommandByFuntion, combine_two_commands
-from patterns_otus_course_brailov.actors import Actor, hard_stop_command, soft_stop_command
+from patterns_otus_course_brailov.mailbox import Mailbox, MailboxFull, OverflowPolicy
+from patterns_otus_course_brailov.actors import (
+    Actor,
+    ActorCommandByFunction,
+    bind_context,
+    current_actor,
+    get_context,
+    hard_stop_command,
+    soft_stop_command,
+)
 
 
 def current_threads_names() -> list[str]:
@@ -163,3 +175,212 @@ def test_actor_soft_stop_command():
 
     assert first_command_executed(), 'first_command не была исполнена'
     assert next_command_executed(), 'next_command не была исполнена'
+
+
+def test_idle_actor_does_not_consume_cpu():
+    """Проверяет что актор без команд спит на очереди, а не крутится в цикле."""
+
+    actor = Actor(name='test_actor')
+
+    with context_manager(actor.start, actor.hard_stop, actor.join):
+        cpu_started_at = time.process_time()
+        time.sleep(0.2)
+        cpu_spent = time.process_time() - cpu_started_at
+
+    assert cpu_spent < 0.05, 'Простаивающий актор тратит процессорное время'
+    assert actor.idle_time > 0.1, 'Время простоя актора не учтено'
+
+
+def test_idle_actor_wakes_up_on_soft_stop():
+    """Проверяет что soft_stop будит простаивающий актор."""
+
+    thread_name = 'test_actor'
+    actor = Actor(name=thread_name)
+
+    actor.start()
+    time.sleep(0.01)  # актор успевает уснуть на пустой очереди
+    actor.soft_stop()
+    actor.join(timeout=0.1)
+
+    assert thread_name not in current_threads_names(), 'Поток актора не был остановлен'
+
+
+def test_actor_busy_time():
+    """Проверяет что актор учитывает время исполнения команд."""
+
+    actor = Actor(name='test_actor')
+
+    actor.add_command(CommandByFuntion(lambda: time.sleep(0.05)))
+    actor.start()
+    actor.soft_stop()
+    actor.join(timeout=0.3)
+
+    assert actor.busy_time >= 0.05
+
+
+def test_actor_executes_batch_in_order():
+    """Проверяет что актор с пакетной выборкой исполняет команды в порядке поступления."""
+
+    actor = Actor(name='test_actor', batch_size=16)
+    executed = []
+
+    actor.add_commands(
+        CommandByFuntion(lambda i=i: executed.append(i))
+        for i in range(100)
+    )
+    actor.start()
+    actor.soft_stop()
+    actor.join(timeout=0.3)
+
+    assert executed == list(range(100))
+
+
+def test_batch_actor_hard_stop_command():
+    """Проверяет что hard_stop_command не дает исполниться оставшимся командам пачки."""
+
+    actor = Actor(name='test_actor', batch_size=16)
+
+    first_command, first_command_executed = create_observable_command('first_command')
+    next_command, next_command_executed = create_observable_command('next_command')
+
+    actor.add_commands([first_command, hard_stop_command, next_command])
+    actor.start()
+    actor.join(timeout=0.3)
+
+    assert first_command_executed(), 'first_command не была исполнена'
+    assert not next_command_executed(), 'next_command была исполнена, но не должна была'
+
+
+def test_bind_context_registers_actor_by_name():
+    actor = Actor(name='bound')
+    with bind_context(actor, register=True):
+        assert current_actor() is actor
+        assert get_context('bound') is actor
+    assert current_actor() is None
+    assert get_context('bound') is None
+
+
+def test_actors_with_same_name_have_own_context():
+    """Проверяет что ActorCommand находит свой актор, даже если у акторов одинаковые имена."""
+
+    first_actor = Actor(name='test_actor')
+    second_actor = Actor(name='test_actor')
+    seen = {}
+
+    for actor in (first_actor, second_actor):
+        actor.add_command(ActorCommandByFunction(lambda ctx, actor=actor: seen.setdefault(id(actor), ctx)))
+        actor.add_command(delay_command(CommandByFuntion(lambda: None), 0.02))
+        actor.start()
+    for actor in (first_actor, second_actor):
+        actor.soft_stop()
+        actor.join(timeout=0.3)
+
+    assert seen == {id(first_actor): first_actor, id(second_actor): second_actor}
+    assert current_actor() is None
+
+
+def test_submit_resolves_with_result():
+    actor = Actor()
+    actor.start()
+
+    future = actor.submit(CommandByFuntion(lambda: 42))
+
+    assert future.result(timeout=1) == 42
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_submit_resolves_with_exception():
+    """Исключение команды попадает в future, а актор продолжает работу."""
+    actor = Actor()
+    actor.start()
+
+    def fail():
+        raise ValueError('boom')
+
+    failed = actor.submit(CommandByFuntion(fail))
+    succeeded = actor.submit(CommandByFuntion(lambda: 'ok'))
+
+    assert isinstance(failed.exception(timeout=1), ValueError)
+    assert succeeded.result(timeout=1) == 'ok'
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_submit_many_returns_futures_in_order():
+    actor = Actor(batch_size=8)
+    futures = actor.submit_many(CommandByFuntion(lambda i=i: i) for i in range(20))
+    actor.start()
+
+    assert [future.result(timeout=1) for future in futures] == list(range(20))
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_submit_futures_are_cancelled_on_hard_stop():
+    """Future команд, которые актор не успел исполнить, отменяются."""
+    actor = Actor()
+    futures = actor.submit_many([hard_stop_command, CommandByFuntion(lambda: None)])
+    actor.start()
+    actor.join(timeout=1)
+
+    assert futures[0].result(timeout=1) is None
+    assert futures[1].cancelled()
+    assert actor.submit(CommandByFuntion(lambda: None)).cancelled()
+
+
+def test_submit_futures_are_cancelled_when_evicted():
+    """Future команды, вытесненной политикой DROP_OLDEST, отменяется и не висит в ожидании."""
+    actor = Actor(mailbox=Mailbox(capacity=1, overflow=OverflowPolicy.DROP_OLDEST))
+    evicted = actor.submit(CommandByFuntion(lambda: 1))
+    kept = actor.submit(CommandByFuntion(lambda: 2))
+
+    assert evicted.cancelled()
+    assert not kept.done()
+    actor.start()
+    assert kept.result(timeout=1) == 2
+    assert not actor._pending_futures
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_submit_futures_rejected_by_full_mailbox():
+    """Проверяет что future команд, не принятых переполненной очередью, отменяются и не висят в ожидании."""
+    actor = Actor(mailbox=Mailbox(capacity=2, overflow=OverflowPolicy.RAISE))
+    first = actor.submit(CommandByFuntion(lambda: 1))
+
+    futures = actor.submit_many([CommandByFuntion(lambda: 2), CommandByFuntion(lambda: 3)])
+    assert not futures[0].done()
+    assert futures[1].cancelled()
+
+    with pytest.raises(MailboxFull):
+        actor.submit(CommandByFuntion(lambda: 4))
+    assert actor._pending_futures == {first, futures[0]}
+
+    actor.start()
+    assert [first.result(timeout=1), futures[0].result(timeout=1)] == [1, 2]
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_submit_is_awaitable():
+    actor = Actor()
+    actor.start()
+
+    async def main():
+        return await asyncio.wrap_future(actor.submit(CommandByFuntion(lambda: 'done')))
+
+    assert asyncio.run(main()) == 'done'
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_hard_stop_returns_rest_of_batch_to_mailbox():
+    """Проверяет что остаток пачки после hard_stop_command возвращается в очередь и забирается через drain."""
+    actor = Actor(batch_size=8)
+    rest = [CommandByFuntion(lambda: None) for _ in range(3)]
+    actor.add_commands([hard_stop_command] + rest)
+    actor.start()
+    actor.join(timeout=1)
+
+    assert [command for _, command in actor.drain()] == rest
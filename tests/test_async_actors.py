@@ -0,0 +1,83 @@
+import asyncio
+
+from patterns_otus_course_brailov.actors import hard_stop_command, soft_stop_command
+from patterns_otus_course_brailov.async_actors import AsyncActor
+from patterns_otus_course_brailov.command import CommandByFuntion
+
+
+def test_async_actor_executes_sync_and_coroutine_commands():
+    """Проверяет что актор исполняет обычные команды и команды, возвращающие корутину."""
+
+    executed = []
+
+    async def coroutine_action():
+        await asyncio.sleep(0.01)
+        executed.append('coroutine')
+
+    async def main():
+        actor = AsyncActor(name='test_actor')
+        actor.start()
+        await actor.add_command(CommandByFuntion(coroutine_action))
+        await actor.add_command(CommandByFuntion(lambda: executed.append('sync')))
+        actor.soft_stop()
+        await actor.join(timeout=0.3)
+
+    asyncio.run(main())
+
+    assert executed == ['coroutine', 'sync']
+
+
+def test_async_actor_backpressure():
+    """Проверяет что add_command ждет, пока в ограниченной очереди не освободится место."""
+
+    async def main():
+        actor = AsyncActor(name='test_actor', maxsize=1)
+        await actor.add_command(CommandByFuntion(lambda: None))
+
+        put = asyncio.ensure_future(actor.add_command(CommandByFuntion(lambda: None)))
+        await asyncio.sleep(0.01)
+        blocked = not put.done()
+
+        actor.start()
+        await asyncio.wait_for(put, timeout=0.3)
+        actor.soft_stop()
+        await actor.join(timeout=0.3)
+        return blocked
+
+    assert asyncio.run(main()), 'add_command не ждал места в очереди'
+
+
+def test_async_actor_hard_stop_command():
+    """Проверяет что hard_stop_command останавливает актор, не исполняя оставшиеся команды."""
+
+    executed = []
+
+    async def main():
+        actor = AsyncActor(name='test_actor')
+        await actor.add_command(CommandByFuntion(lambda: executed.append('first')))
+        await actor.add_command(hard_stop_command)
+        await actor.add_command(CommandByFuntion(lambda: executed.append('next')))
+        actor.start()
+        await actor.join(timeout=0.3)
+
+    asyncio.run(main())
+
+    assert executed == ['first']
+
+
+def test_async_actor_soft_stop_command():
+    """Проверяет что soft_stop_command останавливает актор после исполнения всех команд."""
+
+    executed = []
+
+    async def main():
+        actor = AsyncActor(name='test_actor')
+        await actor.add_command(CommandByFuntion(lambda: executed.append('first')))
+        await actor.add_command(soft_stop_command)
+        await actor.add_command(CommandByFuntion(lambda: executed.append('next')))
+        actor.start()
+        await actor.join(timeout=0.3)
+
+    asyncio.run(main())
+
+    assert executed == ['first', 'next']
@@ -0,0 +1,68 @@
+import pytest
+
+from patterns_otus_course_brailov.command import (
+    CommandByFuntion,
+    MacroCommand,
+    MacroCommandError,
+    combine_commands,
+    combine_two_commands,
+)
+
+
+def test_combine_many_commands():
+    """Проверяет что большое количество команд объединяется без глубокой рекурсии."""
+
+    executed = []
+    command = combine_commands(
+        CommandByFuntion(lambda i=i: executed.append(i))
+        for i in range(100_000)
+    )
+
+    command.execute()
+
+    assert executed == list(range(100_000))
+
+
+def test_nested_macro_commands_are_flattened():
+    """Проверяет что вложенные составные команды разворачиваются в плоский список."""
+
+    first, second, third = (CommandByFuntion(lambda: None) for _ in range(3))
+
+    command = combine_two_commands(combine_two_commands(first, second), third)
+
+    assert command.commands == (first, second, third)
+    assert MacroCommand([first]).append(second).extend([third]).commands == (first, second, third)
+
+
+def failing() -> None:
+    raise ValueError('boom')
+
+
+def test_macro_command_stops_on_first_error():
+    """Проверяет что по умолчанию исполнение прерывается на первой ошибке."""
+
+    executed = []
+    command = MacroCommand([CommandByFuntion(failing), CommandByFuntion(lambda: executed.append(1))])
+
+    with pytest.raises(ValueError):
+        command.execute()
+    assert executed == []
+
+
+def test_macro_command_collects_errors():
+    """Проверяет что в режиме collect_errors исполняются все команды, а ошибки собираются."""
+
+    executed = []
+    command = MacroCommand(
+        [
+            CommandByFuntion(failing),
+            CommandByFuntion(lambda: executed.append(1)),
+            CommandByFuntion(failing),
+        ],
+        collect_errors=True,
+    )
+
+    with pytest.raises(MacroCommandError) as error:
+        command.execute()
+    assert executed == [1]
+    assert len(error.value.errors) == 2
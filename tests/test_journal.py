@@ -0,0 +1,177 @@
+import pytest
+
+from patterns_otus_course_brailov.actors import Actor, ActorCommandByFunction, soft_stop_command
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.journal import (
+    ChecksumMismatch,
+    FsyncPolicy,
+    Journal,
+    JournalError,
+    default_registry,
+    read_records,
+    replay,
+    restore,
+)
+from patterns_otus_course_brailov.movement.commands import MoveCommand, RotateCommand
+from patterns_otus_course_brailov.snapshot import decode_snapshot, encode_snapshot, save_snapshot
+from patterns_otus_course_brailov.world import MoveAllCommand, WorldState
+
+
+def make_world() -> WorldState:
+    world = WorldState()
+    for i in range(3):
+        world.add(position=Vector(i, 0), velocity=Vector(1, i), angle_speed=angles.from_degrees(5))
+    return world
+
+
+def test_actor_journal_replays_to_same_state(tmp_path):
+    """Проверяет что воспроизведение журнала актора приводит к тому же состоянию мира."""
+    world = make_world()
+    initial = encode_snapshot(world)
+    path = tmp_path / 'commands.journal'
+
+    with Journal(path, fsync=FsyncPolicy.NEVER) as journal:
+        actor = Actor(journal=journal)
+        actor.add_commands([MoveCommand(world.view(0)), RotateCommand(world.view(1)), MoveAllCommand(world)])
+        actor.add_command(soft_stop_command)
+        actor.start()
+        actor.join(timeout=1)
+        journal.checkpoint(world)
+
+    assert [record.seq for record in read_records(path)] == [1, 2, 3, 4, 5]
+
+    replica, _ = decode_snapshot(initial)
+    result = replay(path, replica)
+
+    assert result.commands == 3
+    assert result.checkpoints == 1
+    assert encode_snapshot(replica) == encode_snapshot(world)
+
+
+def test_checkpoint_command_on_running_actor(tmp_path):
+    """Проверяет что контрольные точки работающего актора считаются между его командами."""
+    world = make_world()
+    initial = encode_snapshot(world)
+    path = tmp_path / 'commands.journal'
+
+    with Journal(path, fsync=FsyncPolicy.NEVER) as journal:
+        actor = Actor(journal=journal)
+        actor.start()
+        for _ in range(20):
+            actor.add_commands(MoveAllCommand(world) for _ in range(50))
+            actor.add_command(journal.checkpoint_command(world))
+        actor.add_command(soft_stop_command)
+        actor.join(timeout=5)
+
+    replica, _ = decode_snapshot(initial)
+    result = replay(path, replica)
+
+    assert result.commands == 1000
+    assert result.checkpoints == 20
+
+
+def test_unregistered_command_is_rejected_on_send(tmp_path):
+    with Journal(tmp_path / 'commands.journal') as journal:
+        actor = Actor(journal=journal)
+        with pytest.raises(JournalError):
+            actor.add_command(CommandByFuntion(lambda: None))
+        with pytest.raises(JournalError):
+            actor.add_command(MoveCommand(object()))
+
+
+def test_timer_commands_are_journaled(tmp_path):
+    """Проверяет что команды таймеров записываются в журнал при каждом срабатывании."""
+    world = make_world()
+    initial = encode_snapshot(world)
+    path = tmp_path / 'commands.journal'
+
+    with Journal(path, fsync=FsyncPolicy.NEVER) as journal:
+        actor = Actor(journal=journal)
+        with pytest.raises(JournalError):
+            actor.schedule(CommandByFuntion(lambda: None), 0)
+        actor.schedule(MoveCommand(world.view(0)), 0)
+        actor.schedule(MoveAllCommand(world), 0.02)
+        actor.schedule(soft_stop_command, 0.05)
+        actor.start()
+        actor.join(timeout=1)
+
+    replica, _ = decode_snapshot(initial)
+    result = replay(path, replica)
+
+    assert result.commands == 2
+    assert encode_snapshot(replica) == encode_snapshot(world)
+
+
+def test_registered_function_is_replayed_by_name(tmp_path):
+    calls = []
+
+    def remember(actor):
+        calls.append(actor)
+
+    registry = default_registry()
+    registry.register_function('remember', remember)
+    path = tmp_path / 'commands.journal'
+    with Journal(path, registry=registry) as journal:
+        journal.append(*registry.encode(ActorCommandByFunction(remember)))
+
+    replay(path, WorldState(), registry, actor='replica')
+
+    assert calls == ['replica']
+
+
+def test_checkpoint_detects_desync(tmp_path):
+    world = make_world()
+    replica, _ = decode_snapshot(encode_snapshot(world))
+    path = tmp_path / 'commands.journal'
+    with Journal(path) as journal:
+        journal.wrap(MoveAllCommand(world)).execute()
+        journal.checkpoint(world)
+
+    replica.xs[0] += 1
+
+    with pytest.raises(ChecksumMismatch) as error:
+        replay(path, replica)
+    assert error.value.seq == 2
+
+
+def test_restore_from_snapshot_and_torn_tail(tmp_path):
+    """Проверяет восстановление из снимка и журнала, недописанный хвост которого отбрасывается."""
+    world = make_world()
+    journal_path = tmp_path / 'commands.journal'
+    snapshot_path = tmp_path / 'world.snapshot'
+
+    with Journal(journal_path, fsync=FsyncPolicy.ALWAYS) as journal:
+        journal.wrap(MoveAllCommand(world)).execute()
+        save_snapshot(world, snapshot_path, tick=journal.seq)
+        journal.wrap(MoveCommand(world.view(2))).execute()
+    with open(journal_path, 'ab') as file:
+        file.write(b'\x07\x00\x00')
+
+    result = restore(journal_path, snapshot_path)
+
+    assert result.last_seq == 2
+    assert result.commands == 1
+    assert encode_snapshot(result.world) == encode_snapshot(world)
+
+    # дозапись продолжает нумерацию и затирает недописанную запись
+    with Journal(journal_path) as journal:
+        assert journal.seq == 2
+        journal.wrap(MoveAllCommand(world)).execute()
+    assert [record.seq for record in read_records(journal_path)] == [1, 2, 3]
+
+
+def test_entity_added_after_snapshot_is_reported(tmp_path):
+    """Проверяет что команда для объекта, которого нет в снимке, дает JournalError, а не KeyError."""
+    world = make_world()
+    journal_path = tmp_path / 'commands.journal'
+    snapshot_path = tmp_path / 'world.snapshot'
+
+    with Journal(journal_path) as journal:
+        save_snapshot(world, snapshot_path, tick=journal.seq)
+        entity_id = world.add(velocity=Vector(1, 1))
+        journal.wrap(MoveCommand(world.view(entity_id))).execute()
+
+    with pytest.raises(JournalError):
+        restore(journal_path, snapshot_path)
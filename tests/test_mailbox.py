@@ -0,0 +1,197 @@
+import threading
+import time
+
+import pytest
+
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.mailbox import Batch, Lane, Mailbox, MailboxFull, OverflowPolicy
+
+
+def make_commands(count: int) -> list:
+    return [CommandByFuntion(lambda: None) for _ in range(count)]
+
+
+def test_drop_newest():
+    """Проверяет что при переполнении новая команда отбрасывается."""
+
+    first, second, third = make_commands(3)
+    mailbox = Mailbox(capacity=2, overflow=OverflowPolicy.DROP_NEWEST)
+
+    assert mailbox.put(first) and mailbox.put(second)
+    assert not mailbox.put(third)
+
+    assert mailbox.get_many(10) == [first, second]
+    assert mailbox.dropped == 1
+
+
+def test_drop_oldest():
+    """Проверяет что при переполнении отбрасывается самая старая команда."""
+
+    first, second, third = make_commands(3)
+    mailbox = Mailbox(capacity=2, overflow=OverflowPolicy.DROP_OLDEST)
+
+    assert mailbox.put_many([first, second, third]) == 3
+
+    assert mailbox.get_many(10) == [second, third]
+    assert mailbox.dropped == 1
+
+
+def test_drop_oldest_keeps_higher_priority_lanes():
+    """Проверяет что DROP_OLDEST не вытесняет команды приоритетнее новой, а отбрасывает новую."""
+    stop, control, urgent, background = make_commands(4)
+    mailbox = Mailbox(capacity=2, overflow=OverflowPolicy.DROP_OLDEST)
+    mailbox.put(stop, Lane.CONTROL)
+    mailbox.put(control, Lane.CONTROL)
+
+    assert not mailbox.put(background, Lane.BACKGROUND)
+    assert mailbox.put(urgent, Lane.CONTROL)
+
+    assert mailbox.get_many(10) == [control, urgent]
+    assert mailbox.dropped == 2
+
+
+def test_raise():
+    """Проверяет что при переполнении отправитель получает исключение."""
+
+    mailbox = Mailbox(capacity=1, overflow=OverflowPolicy.RAISE)
+    mailbox.put(CommandByFuntion(lambda: None))
+
+    with pytest.raises(MailboxFull):
+        mailbox.put(CommandByFuntion(lambda: None))
+    assert len(mailbox) == 1
+
+
+def test_block_with_timeout():
+    """Проверяет что отправитель ждет не дольше put_timeout."""
+
+    mailbox = Mailbox(capacity=1, overflow=OverflowPolicy.BLOCK_TIMEOUT, put_timeout=0.02)
+    mailbox.put(CommandByFuntion(lambda: None))
+
+    started_at = time.monotonic()
+    with pytest.raises(MailboxFull):
+        mailbox.put(CommandByFuntion(lambda: None))
+
+    assert time.monotonic() - started_at >= 0.02
+    assert mailbox.blocked == 1
+
+
+def test_block_until_consumed():
+    """Проверяет что отправитель ждет, пока получатель не освободит место."""
+
+    first, second = make_commands(2)
+    mailbox = Mailbox(capacity=1)
+    mailbox.put(first)
+
+    producer = threading.Thread(target=mailbox.put, args=(second,))
+    producer.start()
+    time.sleep(0.01)
+    assert producer.is_alive(), 'Отправитель не ждал места в очереди'
+
+    assert mailbox.get() is first
+    producer.join(timeout=0.3)
+
+    assert not producer.is_alive()
+    assert mailbox.get() is second
+    assert mailbox.blocked == 1
+
+
+def test_lanes_keep_order_inside_lane():
+    """Проверяет что внутри полосы сохраняется порядок, а управление обслуживается первым."""
+
+    mailbox = Mailbox()
+    simulation = make_commands(5)
+    control = make_commands(2)
+
+    mailbox.put_many(simulation, lane=Lane.SIMULATION)
+    mailbox.put_many(control, lane=Lane.CONTROL)
+
+    batch = mailbox.get_many(10)
+
+    assert batch[0] is control[0]
+    assert [command for command in batch if command in simulation] == simulation
+    assert [command for command in batch if command in control] == control
+
+
+def test_weighted_lanes_do_not_starve():
+    """Проверяет что полосы обслуживаются пропорционально весам и никто не голодает."""
+
+    mailbox = Mailbox()
+    lanes = {lane: make_commands(100) for lane in Lane}
+    for lane, commands in lanes.items():
+        mailbox.put_many(commands, lane=lane)
+
+    batch = mailbox.get_many(30)
+
+    served = {
+        lane: sum(1 for command in batch if command in commands)
+        for lane, commands in lanes.items()
+    }
+    assert served == {Lane.CONTROL: 16, Lane.INPUT: 8, Lane.SIMULATION: 4, Lane.BACKGROUND: 2}
+
+
+def test_control_lane_latency_under_load():
+    """Проверяет что команда управления выбирается сразу, даже если полоса симуляции забита."""
+
+    mailbox = Mailbox()
+    mailbox.put_many(make_commands(10_000), lane=Lane.SIMULATION)
+    mailbox.get_many(5)
+    control = CommandByFuntion(lambda: None)
+    mailbox.put(control, lane=Lane.CONTROL)
+
+    assert control in mailbox.get_many(2)
+    assert len(mailbox) == 10_000 - 5 - 1
+
+
+def test_drain_and_put_front_keep_lanes_and_order():
+    mailbox = Mailbox(capacity=4)
+    control, first, second = make_commands(3)
+    mailbox.put(first)
+    mailbox.put(second)
+    mailbox.put(control, lane=Lane.CONTROL)
+
+    items = mailbox.drain()
+
+    assert items == [(Lane.CONTROL, control), (Lane.SIMULATION, first), (Lane.SIMULATION, second)]
+    assert len(mailbox) == 0
+
+    newer = CommandByFuntion(lambda: None)
+    mailbox.put(newer)
+    mailbox.put_front(items)
+
+    assert mailbox.get_many(10) == [control, first, second, newer]
+
+
+def test_get_batch_keeps_lanes_and_put_back_ignores_capacity():
+    mailbox = Mailbox(capacity=2, overflow=OverflowPolicy.RAISE)
+    control, first, second = make_commands(3)
+    mailbox.put(first, lane=Lane.BACKGROUND)
+    mailbox.put(control, lane=Lane.CONTROL)
+
+    batch = Batch()
+    assert mailbox.get_batch(batch, 10)
+    assert batch.commands == [control, first]
+    assert batch.lanes == [Lane.CONTROL, Lane.BACKGROUND]
+
+    mailbox.put(second)
+    mailbox.put(CommandByFuntion(lambda: None))
+    mailbox.put_back([(Lane.BACKGROUND, first)])
+
+    assert len(mailbox) == 3
+    assert mailbox.drain()[-1] == (Lane.BACKGROUND, first)
+
+
+def test_drain_takes_unclaimed_rest_of_batch():
+    mailbox = Mailbox()
+    commands = make_commands(4)
+    mailbox.put_many(commands)
+    batch = Batch()
+    mailbox.get_batch(batch, 3)
+    newer = CommandByFuntion(lambda: None)
+    mailbox.put(newer)
+    batch.next = 1
+
+    assert [command for _, command in mailbox.drain(batch)] == commands[1:] + [newer]
+    assert batch.drained
+    assert mailbox.owns(batch, 0)
+    assert not mailbox.owns(batch, 1)
+    assert mailbox.drain(batch) == []
@@ -0,0 +1,60 @@
+import time
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.metrics import ActorMetrics, Histogram, InMemorySink, render_text
+
+
+def failing() -> None:
+    raise ValueError('boom')
+
+
+def test_actor_metrics():
+    """Проверяет что актор собирает метрики исполнения команд."""
+
+    sink = InMemorySink()
+    actor = Actor(name='test_actor', metrics=ActorMetrics(sink=sink))
+
+    actor.add_command(CommandByFuntion(lambda: time.sleep(0.01)))
+    actor.add_commands(CommandByFuntion(lambda: None) for _ in range(3))
+    actor.add_command(CommandByFuntion(failing))
+    actor.start()
+    actor.soft_stop()
+    actor.join(timeout=0.3)
+
+    actor.metrics.export()
+    snapshot = sink.last
+
+    assert snapshot['actor'] == 'test_actor'
+    assert snapshot['commands'] == 5
+    assert snapshot['errors'] == 1
+    assert snapshot['errors_by_type'] == {'CommandByFuntion': 1}
+    assert snapshot['max_queue_depth'] >= 4
+    assert snapshot['queue_depth'] == 0
+    assert snapshot['wait']['count'] == 5
+    assert snapshot['wait']['sum'] >= 0.01 * 4, 'Команды не ждали в очереди, пока исполнялась первая'
+    assert snapshot['execution']['CommandByFuntion']['count'] == 5
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1, float('inf')))
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+
+
+def test_render_text():
+    """Проверяет экспорт метрик в текстовом формате."""
+
+    metrics = ActorMetrics(buckets=(0.1, float('inf')))
+    metrics.bind('tank', lambda: 3)
+    metrics.record('MoveCommand', wait=0.2, duration=0.05, error=False)
+
+    text = render_text(metrics.snapshot())
+
+    assert 'actor_commands_total{actor="tank"} 1' in text
+    assert 'actor_queue_depth{actor="tank"} 3' in text
+    assert 'actor_wait_seconds_bucket{actor="tank",le="+Inf"} 1' in text
+    assert 'actor_execution_seconds_bucket{actor="tank",command="MoveCommand",le="0.1"} 1' in text
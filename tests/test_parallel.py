@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from patterns_otus_course_brailov.command import CommandByFuntion, MacroCommand, MacroCommandError
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.movement.commands import MoveCommand
+from patterns_otus_course_brailov.parallel import KeyedCommand, ParallelExecutor, partition
+from patterns_otus_course_brailov.world import WorldState
+
+
+def test_partition_groups_commands_by_shared_objects():
+    """Проверяет что команды над одним объектом попадают в одну группу в исходном порядке."""
+    world = WorldState()
+    first, second, third = (world.add() for _ in range(3))
+    commands = [
+        MoveCommand(world.view(first)),
+        MoveCommand(world.view(second)),
+        MoveCommand(world.view(first)),
+        MacroCommand([MoveCommand(world.view(second)), MoveCommand(world.view(third))]),
+        MoveCommand(world.view(third)),
+    ]
+
+    groups = partition(commands)
+
+    assert groups == [[commands[0], commands[2]], [commands[1], commands[3], commands[4]]]
+
+
+def test_partition_ignores_read_only_keys():
+    a = KeyedCommand(CommandByFuntion(lambda: None), writes=['a'], reads=['config'])
+    b = KeyedCommand(CommandByFuntion(lambda: None), writes=['b'], reads=['config', 'a'])
+    c = KeyedCommand(CommandByFuntion(lambda: None), writes=['c'], reads=['config'])
+
+    assert partition([a, b, c]) == [[a, b], [c]]
+
+
+def test_partition_with_unknown_command_is_serial():
+    world = WorldState()
+    commands = [MoveCommand(world.view(world.add())), CommandByFuntion(lambda: None)]
+
+    assert partition(commands) == [commands]
+
+
+def test_executor_preserves_per_key_order():
+    order: dict[int, list[int]] = {key: [] for key in range(8)}
+    threads = set()
+
+    def step(key: int, index: int):
+        def run():
+            order[key].append(index)
+            threads.add(threading.current_thread().name)
+        return KeyedCommand(CommandByFuntion(run), writes=[key])
+
+    commands = [step(key, index) for index in range(100) for key in range(8)]
+    with ParallelExecutor(workers=4) as executor:
+        executor.execute(commands)
+        executor.execute(commands)
+
+    assert all(values == list(range(100)) * 2 for values in order.values())
+    assert threads <= {f'parallel-{index}' for index in range(4)}
+
+
+def test_executor_moves_world_entities():
+    world = WorldState()
+    ids = [world.add(velocity=Vector(1, 2)) for _ in range(50)]
+
+    with ParallelExecutor(workers=3) as executor:
+        executor.execute(MoveCommand(world.view(entity_id)) for entity_id in ids for _ in range(2))
+
+    assert all(world.view(entity_id).get_position() == Vector(2, 4) for entity_id in ids)
+
+
+def test_executor_collects_errors():
+    def fail():
+        raise ValueError('boom')
+
+    done = []
+    commands = [
+        KeyedCommand(CommandByFuntion(fail), writes=[1]),
+        KeyedCommand(CommandByFuntion(lambda: done.append(1)), writes=[1]),
+        KeyedCommand(CommandByFuntion(fail), writes=[2]),
+    ]
+    with ParallelExecutor(workers=2) as executor:
+        with pytest.raises(MacroCommandError) as error:
+            executor.execute(commands)
+
+    assert len(error.value.errors) == 2
+    assert done == [1]
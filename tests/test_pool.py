@@ -0,0 +1,102 @@
+import threading
+import time
+
+from patterns_otus_course_brailov.actors import hard_stop_command, soft_stop_command
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.pool import ActorPool
+
+
+def test_pool_keeps_per_actor_order():
+    """Проверяет что каждый актор пула исполняет свои команды в порядке поступления."""
+
+    pool = ActorPool(workers=4, quantum=8)
+    actors = [pool.create_actor() for _ in range(200)]
+    executed = {actor.name: [] for actor in actors}
+
+    pool.start()
+    try:
+        for i in range(50):
+            for actor in actors:
+                actor.add_command(CommandByFuntion(lambda name=actor.name, i=i: executed[name].append(i)))
+        for actor in actors:
+            actor.soft_stop()
+        for actor in actors:
+            actor.join(timeout=1)
+    finally:
+        pool.stop()
+        pool.join(timeout=0.3)
+
+    assert all(commands == list(range(50)) for commands in executed.values())
+
+
+def test_pool_uses_fixed_number_of_threads():
+    """Проверяет что количество потоков не зависит от количества акторов."""
+
+    threads_before = threading.active_count()
+    pool = ActorPool(workers=2)
+    for _ in range(1000):
+        pool.create_actor()
+
+    pool.start()
+    try:
+        assert threading.active_count() == threads_before + 2
+    finally:
+        pool.stop()
+        pool.join(timeout=0.3)
+
+
+def test_hot_actor_does_not_starve_others():
+    """Проверяет что загруженный актор не мешает обслуживать остальных."""
+
+    pool = ActorPool(workers=1, quantum=4)
+    hot_actor = pool.create_actor('hot')
+    cold_actor = pool.create_actor('cold')
+    hot_executed = []
+    hot_executed_before_cold = []
+
+    pool.start()
+    try:
+        hot_actor.add_commands(
+            CommandByFuntion(lambda: hot_executed.append(time.sleep(0.001)))
+            for _ in range(200)
+        )
+        cold_actor.add_command(CommandByFuntion(lambda: hot_executed_before_cold.append(len(hot_executed))))
+        cold_actor.soft_stop()
+        cold_actor.join(timeout=1)
+        hot_actor.hard_stop()
+    finally:
+        pool.stop()
+        pool.join(timeout=0.3)
+
+    assert hot_executed_before_cold and hot_executed_before_cold[0] < 20
+
+
+def test_pooled_actor_stop_commands():
+    """Проверяет что команды остановки работают с акторами пула."""
+
+    pool = ActorPool(workers=2)
+    hard_actor = pool.create_actor()
+    soft_actor = pool.create_actor()
+    executed = []
+
+    hard_actor.add_commands([
+        CommandByFuntion(lambda: executed.append('hard-first')),
+        hard_stop_command,
+        CommandByFuntion(lambda: executed.append('hard-next')),
+    ])
+    soft_actor.add_commands([
+        CommandByFuntion(lambda: executed.append('soft-first')),
+        soft_stop_command,
+        CommandByFuntion(lambda: executed.append('soft-next')),
+    ])
+
+    pool.start()
+    try:
+        hard_actor.join(timeout=0.3)
+        soft_actor.join(timeout=0.3)
+    finally:
+        pool.stop()
+        pool.join(timeout=0.3)
+
+    assert hard_actor.is_stopped() and soft_actor.is_stopped()
+    assert sorted(executed) == ['hard-first', 'soft-first', 'soft-next']
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from patterns_otus_course_brailov.actors import ActorCommand
+from patterns_otus_course_brailov.command import Command
+from patterns_otus_course_brailov.process_actors import ProcessActor
+
+
+class SquareCommand(Command):
+    def __init__(self, value: int):
+        self.value = value
+
+    def execute(self) -> int:
+        return self.value * self.value
+
+
+class FailingCommand(Command):
+    def execute(self) -> None:
+        raise ValueError('boom')
+
+
+class CounterCommand(ActorCommand):
+    """Считает свои вызовы в контексте процесса актора."""
+
+    def actor_action(self, actor):
+        actor.state['counter'] = actor.state.get('counter', 0) + 1
+        return actor.name, actor.pid, actor.state['counter']
+
+
+def test_process_actor_returns_results_and_errors():
+    """Проверяет что результаты и исключения команд возвращаются в вызывающий процесс."""
+
+    actor = ProcessActor(name='test_actor')
+    actor.start()
+    try:
+        squares = [actor.add_command(SquareCommand(i)) for i in range(10)]
+        failed = actor.add_command(FailingCommand())
+        actor.soft_stop()
+        actor.join(timeout=5)
+    finally:
+        actor.hard_stop()
+
+    assert [future.result() for future in squares] == [i * i for i in range(10)]
+    with pytest.raises(ValueError):
+        failed.result()
+
+
+def test_process_actor_keeps_context_between_commands():
+    """Проверяет что контекст актора живет в процессе-исполнителе между командами."""
+
+    actor = ProcessActor(name='test_actor')
+    actor.start()
+    try:
+        results = [actor.add_command(CounterCommand()).result(timeout=5) for _ in range(3)]
+    finally:
+        actor.soft_stop()
+        actor.join(timeout=5)
+
+    names, pids, counters = zip(*results)
+    assert set(names) == {'test_actor'}
+    assert len(set(pids)) == 1 and pids[0] != os.getpid()
+    assert counters == (1, 2, 3)
@@ -0,0 +1,105 @@
+import io
+import threading
+import time
+import types
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import Command, CommandByFuntion, combine_commands
+from patterns_otus_course_brailov.profiling import Profiler, frame_label
+
+
+class SlowCommand(Command):
+    def execute(self) -> None:
+        busy_wait(0.05)
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class RecordingHook:
+    def __init__(self):
+        self.events = []
+
+    def before(self, command):
+        self.events.append(('before', command))
+
+    def after(self, command, error):
+        self.events.append(('after', command, type(error)))
+
+
+def run_commands(actor: Actor, commands) -> None:
+    done = threading.Event()
+    actor.add_commands(list(commands) + [CommandByFuntion(done.set)])
+    actor.start()
+    assert done.wait(5)
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_hooks_see_commands_and_errors():
+    hook = RecordingHook()
+    actor = Actor()
+    actor.add_hook(hook)
+
+    def fail():
+        raise ValueError()
+
+    ok, failing = CommandByFuntion(lambda: None), CommandByFuntion(fail)
+    run_commands(actor, [ok, failing])
+
+    assert hook.events[:4] == [
+        ('before', ok), ('after', ok, type(None)),
+        ('before', failing), ('after', failing, ValueError),
+    ]
+
+
+def test_profiler_aggregates_by_command_class():
+    """Проверяет что профилировщик относит время и стеки к классу команды, в том числе внутри combine_commands."""
+    profiler = Profiler(frequency=200, sample_rate=1)
+    actor = Actor()
+    profiler.attach(actor)
+
+    run_commands(actor, [SlowCommand(), combine_commands([SlowCommand(), SlowCommand()])])
+    profiler.detach()
+
+    assert profiler.timings['SlowCommand'].count == 1
+    assert profiler.timings['MacroCommand'].count == 1
+    assert profiler.timings['MacroCommand'].total >= 0.1
+    assert profiler.by_command()['SlowCommand'] > 0
+    assert profiler.by_command()['MacroCommand'] > 0
+
+    output = io.StringIO()
+    profiler.dump_collapsed(output)
+    lines = output.getvalue().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+        assert stack.split(';')[0] in ('SlowCommand', 'MacroCommand', 'CommandByFuntion')
+    assert any('SlowCommand.execute' in line and 'busy_wait' in line for line in lines)
+
+
+def test_stack_sampling_does_not_hook_commands():
+    """Проверяет что стеки снимаются и без замеров времени команд."""
+    profiler = Profiler(frequency=200)
+    actor = Actor()
+    profiler.attach(actor)
+
+    run_commands(actor, [SlowCommand()])
+    profiler.detach()
+
+    assert not profiler.timings
+    assert profiler.by_command()['SlowCommand'] > 0
+
+
+def test_frame_label_without_qualname():
+    """Проверяет что без co_qualname (Python < 3.11) класс метода берется из self."""
+    code = types.SimpleNamespace(co_filename='/src/commands.py', co_name='execute')
+    method = types.SimpleNamespace(f_code=code, f_locals={'self': SlowCommand()}, f_lineno=7)
+    function = types.SimpleNamespace(f_code=code, f_locals={}, f_lineno=7)
+
+    assert frame_label(method) == 'commands.py:SlowCommand.execute:7'
+    assert frame_label(function) == 'commands.py:execute:7'
@@ -0,0 +1,88 @@
+import pytest
+
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.snapshot import (
+    DeltaEncoder,
+    SnapshotError,
+    apply_delta,
+    decode_snapshot,
+    encode_snapshot,
+    load_snapshot,
+    save_snapshot,
+    snapshot_buffers,
+)
+from patterns_otus_course_brailov.world import WorldState
+
+
+def make_world(count: int = 10) -> WorldState:
+    world = WorldState()
+    for i in range(count):
+        world.add(
+            position=Vector(i, -i),
+            velocity=Vector(1 if i % 2 else 0, 0),
+            dirrection=angles.from_degrees(i),
+            angle_speed=angles.from_degrees(1),
+        )
+    return world
+
+
+def test_snapshot_roundtrip():
+    """Проверяет что мир восстанавливается из снимка вместе с удаленными ячейками."""
+    world = make_world()
+    world.remove(3)
+
+    restored, tick = decode_snapshot(encode_snapshot(world, tick=7))
+
+    assert tick == 7
+    assert len(restored) == 9
+    assert not restored.is_alive(3)
+    assert encode_snapshot(restored, tick=7) == encode_snapshot(world, tick=7)
+    # идентификатор удаленного объекта переиспользуется и после восстановления
+    assert restored.add() == 3
+
+
+def test_snapshot_buffers_share_world_memory():
+    world = make_world()
+    buffers = snapshot_buffers(world)
+
+    assert buffers[1].obj is world.xs
+    assert sum(len(buffer) for buffer in buffers) == len(encode_snapshot(world))
+
+
+def test_snapshot_file_roundtrip(tmp_path):
+    world = make_world(1000)
+    path = tmp_path / 'world.snapshot'
+
+    save_snapshot(world, path, tick=3)
+    restored, tick = load_snapshot(path)
+
+    assert tick == 3
+    assert encode_snapshot(restored) == encode_snapshot(world)
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(SnapshotError):
+        decode_snapshot(b'x' * 64)
+    with pytest.raises(SnapshotError):
+        decode_snapshot(encode_snapshot(make_world())[:-1])
+
+
+def test_delta_contains_only_changed_entities():
+    """Проверяет что дельта содержит только изменившиеся объекты и догоняет копию мира."""
+    world = make_world(1000)
+    replica, _ = decode_snapshot(encode_snapshot(world))
+    encoder = DeltaEncoder(world, block=16)
+
+    world.move_all()
+    assert encoder.changed_ids() == list(range(1, 1000, 2))
+    world.remove(0)
+    world.add(position=Vector(5, 5))
+    world.add(position=Vector(6, 6))
+
+    apply_delta(replica, encoder.encode(tick=1))
+
+    assert encode_snapshot(replica) == encode_snapshot(world)
+    assert len(replica) == len(world)
+    assert encoder.changed_ids() == []
+    assert len(encoder.encode()) < 100
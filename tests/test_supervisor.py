@@ -0,0 +1,196 @@
+import threading
+import time
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.mailbox import Lane, Mailbox, OverflowPolicy
+from patterns_otus_course_brailov.supervisor import Supervisor
+
+
+def wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def slow_commands(executed: list, count: int, delay: float = 0.01):
+    def step(index: int):
+        def run():
+            time.sleep(delay)
+            executed.append(index)
+        return CommandByFuntion(run)
+    return [step(index) for index in range(count)]
+
+
+def test_drain_hands_pending_commands_to_replacement():
+    """Проверяет что неисполненные за отведенное время команды исполняет замена, по порядку и по одному разу."""
+    executed = []
+    supervisor = Supervisor(Actor)
+    supervisor.start()
+    supervisor.add_commands(slow_commands(executed, 30))
+
+    replacement = Actor(name='replacement')
+    supervisor.drain(timeout=0.05, replacement=replacement)
+    supervisor.add_command(CommandByFuntion(lambda: executed.append('new')))
+
+    assert supervisor.actor is replacement
+    assert wait_for(lambda: len(executed) == 31)
+    assert executed == list(range(30)) + ['new']
+    supervisor.drain(timeout=1)
+
+
+def test_drain_returns_pending_commands():
+    executed = []
+    supervisor = Supervisor(Actor)
+    supervisor.start()
+    commands = slow_commands(executed, 30)
+    supervisor.add_commands(commands, Lane.BACKGROUND)
+
+    pending = supervisor.drain(timeout=0.05)
+
+    assert pending
+    assert all(lane is Lane.BACKGROUND for lane, _ in pending)
+    assert executed + [commands.index(command) for _, command in pending] == list(range(30))
+    assert not supervisor.actor.is_alive()
+
+
+def test_hung_actor_is_restarted_with_its_mailbox():
+    """Проверяет что зависший актор заменяется новым, который исполняет накопившиеся команды."""
+    release = threading.Event()
+    executed = []
+    supervisor = Supervisor(Actor, hang_timeout=0.1, check_interval=0.02)
+    supervisor.start()
+    hung = supervisor.actor
+
+    supervisor.add_command(CommandByFuntion(release.wait))
+    supervisor.add_commands(CommandByFuntion(lambda i=i: executed.append(i)) for i in range(5))
+
+    assert wait_for(lambda: executed == list(range(5)))
+    assert supervisor.restarts == 1
+    assert supervisor.actor is not hung
+
+    release.set()
+    hung.join(timeout=1)
+    assert not hung.is_alive()
+    supervisor.drain(timeout=1)
+
+
+class Crash(BaseException):
+    pass
+
+
+def test_dead_actor_is_restarted(monkeypatch):
+    # падение потока актора здесь ожидаемо
+    monkeypatch.setattr(threading, 'excepthook', lambda args: None)
+    executed = []
+    supervisor = Supervisor(Actor, check_interval=0.02)
+    supervisor.start()
+
+    def crash():
+        raise Crash()
+
+    supervisor.add_command(CommandByFuntion(crash))
+    assert wait_for(lambda: supervisor.restarts == 1)
+    supervisor.add_command(CommandByFuntion(lambda: executed.append(1)))
+
+    assert wait_for(lambda: executed == [1])
+    supervisor.drain(timeout=1)
+
+
+def test_actor_stopped_by_command_is_not_restarted():
+    supervisor = Supervisor(Actor, check_interval=0.02)
+    supervisor.start()
+
+    supervisor.actor.soft_stop()
+    supervisor.actor.join(timeout=1)
+    time.sleep(0.1)
+
+    assert supervisor.restarts == 0
+
+
+def test_consecutive_restarts_back_off():
+    """Проверяет что повторный перезапуск откладывает запуск актора, не блокируя вызывающего."""
+    supervisor = Supervisor(Actor, backoff_initial=0.1, check_interval=0.02)
+    supervisor.start()
+
+    supervisor.restart()
+    assert supervisor.actor.is_alive()
+
+    started_at = time.monotonic()
+    supervisor.restart()
+    assert time.monotonic() - started_at < 0.05
+    assert not supervisor.actor.is_alive()
+
+    executed = []
+    supervisor.add_command(CommandByFuntion(lambda: executed.append(time.monotonic() - started_at)))
+    assert wait_for(lambda: executed)
+    assert executed[0] >= 0.1
+    assert supervisor.restarts == 2
+    supervisor.drain(timeout=1)
+
+
+def test_hung_batch_is_handed_over_in_order():
+    """Проверяет что остаток пачки зависшего актора исполняется новым актором первым и по порядку."""
+    release = threading.Event()
+    executed = []
+    supervisor = Supervisor(lambda: Actor(batch_size=4), hang_timeout=0.1, check_interval=0.02)
+    supervisor.add_command(CommandByFuntion(release.wait))
+    supervisor.add_commands(CommandByFuntion(lambda i=i: executed.append(i)) for i in range(1, 7))
+    supervisor.start()
+
+    assert wait_for(lambda: len(executed) == 6)
+    assert executed == list(range(1, 7))
+    release.set()
+    supervisor.drain(timeout=1)
+
+
+def test_sweep_ignores_capacity_of_replacement():
+    """Проверяет что команды, пришедшие зависшему актору после перезапуска, не теряются при заполненной очереди замены."""
+    release_old, release_new = threading.Event(), threading.Event()
+    executed = []
+    supervisor = Supervisor(lambda: Actor(mailbox=Mailbox(capacity=1, overflow=OverflowPolicy.RAISE)), check_interval=0.02)
+    supervisor.start()
+    old = supervisor.actor
+    old.add_command(CommandByFuntion(release_old.wait))
+    assert wait_for(lambda: old.heartbeat is not None)
+
+    supervisor.restart()
+    new = supervisor.actor
+    new.add_command(CommandByFuntion(release_new.wait))
+    assert wait_for(lambda: new.heartbeat is not None)
+    new.add_command(CommandByFuntion(lambda: executed.append(1)))
+    old.add_command(CommandByFuntion(lambda: executed.append(2)))
+
+    assert wait_for(lambda: len(new.mailbox) == 2)
+    release_new.set()
+    assert wait_for(lambda: executed == [1, 2])
+    release_old.set()
+    supervisor.drain(timeout=1)
+
+
+def test_restart_under_load_runs_every_command_once_in_order():
+    """Проверяет что при перезапусках под нагрузкой каждая команда исполняется ровно один раз и по порядку."""
+    count = 20000
+    executed = []
+    supervisor = Supervisor(lambda: Actor(batch_size=16), backoff_initial=0, check_interval=0.02)
+    supervisor.start()
+
+    def produce():
+        for index in range(count):
+            supervisor.add_command(CommandByFuntion(lambda index=index: executed.append(index)))
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    for _ in range(10):
+        time.sleep(0.005)
+        supervisor.restart()
+    producer.join()
+
+    assert wait_for(lambda: len(executed) >= count, timeout=5)
+    time.sleep(0.05)
+    assert executed == list(range(count))
+    assert supervisor.restarts == 10
+    supervisor.drain(timeout=1)
@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.geometry.vectors import Vector
+from patterns_otus_course_brailov.journal import FsyncPolicy, Journal, replay
+from patterns_otus_course_brailov.mailbox import Mailbox, OverflowPolicy
+from patterns_otus_course_brailov.snapshot import decode_snapshot, encode_snapshot
+from patterns_otus_course_brailov.world import MoveAllCommand, WorldState
+from patterns_otus_course_brailov.ticks import CatchUpPolicy, TickScheduler, percentile
+
+
+def run_scheduler(scheduler: TickScheduler, actor: Actor, seconds: float) -> None:
+    actor.start()
+    scheduler.start()
+    time.sleep(seconds)
+    scheduler.stop()
+    scheduler.join(timeout=0.3)
+    actor.soft_stop()
+    actor.join(timeout=0.3)
+
+
+def test_recurring_command_runs_every_tick():
+    """Проверяет что повторяющаяся команда исполняется на каждом тике."""
+
+    actor = Actor(name='test_actor')
+    scheduler = TickScheduler(actor, interval=0.01)
+    executed = []
+    scheduler.add_recurring(CommandByFuntion(lambda: executed.append(time.monotonic())))
+
+    run_scheduler(scheduler, actor, 0.2)
+
+    stats = scheduler.stats.snapshot()
+    assert 10 <= len(executed) <= 25
+    assert stats['ticks'] == len(executed)
+    assert stats['overruns'] == 0
+    assert stats['duration_p99'] < 0.01
+
+
+def test_overruns_are_detected_and_skipped():
+    """Проверяет что медленные тики считаются перегруженными, а пропущенные тики - пропускаются."""
+
+    actor = Actor(name='test_actor')
+    scheduler = TickScheduler(actor, interval=0.01, policy=CatchUpPolicy.SKIP)
+    scheduler.add_recurring(CommandByFuntion(lambda: time.sleep(0.025)))
+
+    run_scheduler(scheduler, actor, 0.2)
+
+    stats = scheduler.stats.snapshot()
+    assert stats['overruns'] > 0
+    assert stats['skipped'] > 0
+    assert stats['duration_p50'] >= 0.025
+    assert stats['queue_depth_max'] == 0, 'Новый тик отправлен, пока не исполнен предыдущий'
+
+
+def test_catch_up_sends_missed_ticks():
+    """Проверяет что при CATCH_UP пропущенные тики отправляются актору."""
+
+    actor = Actor(name='test_actor')
+    scheduler = TickScheduler(actor, interval=0.01, policy=CatchUpPolicy.CATCH_UP)
+    scheduler.add_recurring(CommandByFuntion(lambda: time.sleep(0.025)))
+
+    run_scheduler(scheduler, actor, 0.2)
+
+    stats = scheduler.stats.snapshot()
+    assert stats['overruns'] > 0
+    assert stats['queue_depth_max'] >= 1
+
+
+@pytest.mark.parametrize('overflow', [OverflowPolicy.DROP_NEWEST, OverflowPolicy.DROP_OLDEST])
+def test_dropped_tick_end_does_not_stall_scheduler(overflow):
+    """Проверяет что тик, отметку конца которого отбросила ограниченная очередь, не считается вечно незавершенным."""
+    actor = Actor(name='test_actor', mailbox=Mailbox(capacity=2, overflow=overflow))
+    scheduler = TickScheduler(actor, interval=0.01, policy=CatchUpPolicy.SKIP)
+    scheduler.add_recurring(CommandByFuntion(lambda: time.sleep(0.001)))
+    scheduler.add_recurring(CommandByFuntion(lambda: time.sleep(0.001)))
+
+    run_scheduler(scheduler, actor, 0.2)
+
+    assert scheduler.stats.snapshot()['ticks'] >= 10
+
+
+def test_scheduler_runs_on_journaled_actor(tmp_path):
+    """Проверяет что отметка конца тика не пишется в журнал и не останавливает планировщик."""
+    world = WorldState()
+    world.add(position=Vector(0, 0), velocity=Vector(1, 1))
+    initial = encode_snapshot(world)
+    path = tmp_path / 'commands.journal'
+
+    with Journal(path, fsync=FsyncPolicy.NEVER) as journal:
+        actor = Actor(name='test_actor', journal=journal)
+        scheduler = TickScheduler(actor, interval=0.01)
+        scheduler.add_recurring(MoveAllCommand(world))
+        actor.start()
+        scheduler.start()
+        time.sleep(0.1)
+        assert scheduler._thread.is_alive()
+        scheduler.stop()
+        scheduler.join(timeout=0.3)
+        actor.soft_stop()
+        actor.join(timeout=0.3)
+
+    stats = scheduler.stats.snapshot()
+    assert stats['ticks'] >= 5
+    assert len(scheduler.stats.durations) == stats['ticks']
+
+    replica, _ = decode_snapshot(initial)
+    result = replay(path, replica)
+    assert result.commands == stats['ticks']
+    assert encode_snapshot(replica) == encode_snapshot(world)
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile(list(range(1, 101)), 99) == 99
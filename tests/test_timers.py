@@ -0,0 +1,113 @@
+import threading
+import time
+
+from patterns_otus_course_brailov.actors import Actor
+from patterns_otus_course_brailov.command import CommandByFuntion
+from patterns_otus_course_brailov.metrics import ActorMetrics
+from patterns_otus_course_brailov.timers import TimerHandle, TimerQueue
+
+
+def test_timer_queue_orders_by_deadline_and_skips_cancelled():
+    queue = TimerQueue()
+    late = TimerHandle(CommandByFuntion(lambda: None), deadline=3)
+    early = TimerHandle(CommandByFuntion(lambda: None), deadline=1)
+    cancelled = TimerHandle(CommandByFuntion(lambda: None), deadline=0)
+
+    assert queue.push(late)
+    assert queue.push(early)
+    assert queue.push(cancelled)
+    cancelled.cancel()
+
+    assert queue.next_deadline() == 1
+    assert queue.pop_due(2) == [early]
+    assert queue.pop_due(5) == [late]
+    assert queue.next_deadline() is None
+
+
+def test_actor_schedule_respects_delay():
+    """Отложенная команда исполняется не раньше заданной задержки."""
+    executed_at = []
+    actor = Actor()
+    actor.start()
+
+    started_at = time.monotonic()
+    actor.schedule(CommandByFuntion(lambda: executed_at.append(time.monotonic())), 0.1)
+    time.sleep(0.3)
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+    assert len(executed_at) == 1
+    assert executed_at[0] - started_at >= 0.1
+
+
+def test_earlier_timer_wakes_up_waiting_actor():
+    """Новый более ранний таймер не ждет срабатывания уже запланированного."""
+    executed = threading.Event()
+    actor = Actor()
+    actor.start()
+
+    actor.schedule(CommandByFuntion(lambda: None), 10)
+    time.sleep(0.05)
+    actor.schedule(CommandByFuntion(executed.set), 0.01)
+
+    assert executed.wait(1)
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+
+def test_actor_schedule_every_and_cancel():
+    """Периодическая команда повторяется, пока таймер не отменят."""
+    counter = []
+    actor = Actor()
+    actor.start()
+
+    handle = actor.schedule_every(CommandByFuntion(lambda: counter.append(1)), 0.02)
+    time.sleep(0.2)
+    handle.cancel()
+    executed = len(counter)
+    time.sleep(0.1)
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+    assert executed >= 3
+    assert len(counter) <= executed + 1
+
+
+def test_many_timers_do_not_start_threads():
+    """Таймеры исполняет поток актора, а не отдельные потоки."""
+    counter = []
+    actor = Actor()
+    actor.start()
+    threads = threading.active_count()
+
+    for i in range(1000):
+        actor.schedule(CommandByFuntion(lambda: counter.append(1)), 0.001 * (i % 50))
+
+    assert threading.active_count() == threads
+    time.sleep(0.3)
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+    assert len(counter) == 1000
+
+
+def test_timer_commands_are_counted_in_metrics():
+    """Отложенные и периодические команды попадают в метрики актора."""
+    def fail():
+        raise ValueError()
+
+    actor = Actor(metrics=ActorMetrics())
+    actor.start()
+    actor.schedule(CommandByFuntion(fail), 0.01)
+    handle = actor.schedule_every(CommandByFuntion(lambda: None), 0.01)
+    time.sleep(0.1)
+    handle.cancel()
+    actor.hard_stop()
+    actor.join(timeout=1)
+
+    snapshot = actor.metrics.snapshot()
+    assert snapshot['commands'] >= 3
+    assert snapshot['errors_by_type'] == {'CommandByFuntion': 1}
+    assert snapshot['wait']['count'] == snapshot['commands']
+    # ожидание отсчитывается от срока срабатывания, а не от планирования
+    assert snapshot['wait']['sum'] < 0.01 * snapshot['commands']
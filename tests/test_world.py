@@ -0,0 +1,66 @@
+import pytest
+
+from patterns_otus_course_brailov.geometry import angles
+from patterns_otus_course_brailov.geometry.vectors import Vector, roughly_equal
+from patterns_otus_course_brailov.movement.commands import MoveCommand, RotateCommand
+from patterns_otus_course_brailov.world import MoveAllCommand, RotateAllCommand, WorldState
+
+
+def test_views_work_with_commands():
+    """Проверяет что представления объектов мира работают с MoveCommand и RotateCommand."""
+
+    world = WorldState()
+    tank = world.view(world.add(
+        position=Vector(12, 5),
+        velocity=Vector(-7, 3),
+        dirrection=angles.from_degrees(90),
+        angle_speed=angles.from_degrees(1),
+    ))
+
+    MoveCommand(tank).execute()
+    RotateCommand(tank).execute()
+
+    assert roughly_equal(tank.get_position(), Vector(5, 8))
+    assert angles.roughly_equal(tank.get_dirrection(), angles.from_degrees(91))
+
+
+def test_step_all_entities():
+    """Проверяет что общие шаги двигают и поворачивают все объекты мира."""
+
+    world = WorldState()
+    ids = [
+        world.add(position=Vector(i, 0), velocity=Vector(1, 1), angle_speed=angles.from_degrees(10))
+        for i in range(5)
+    ]
+
+    MoveAllCommand(world).execute()
+    RotateAllCommand(world).execute()
+
+    for i, entity_id in enumerate(ids):
+        view = world.view(entity_id)
+        assert roughly_equal(view.get_position(), Vector(i + 1, 1))
+        assert angles.roughly_equal(view.get_dirrection(), angles.from_degrees(10))
+
+
+def test_remove_and_reuse_slot():
+    """Проверяет что идентификатор удаленного объекта переиспользуется, а удаленный объект не двигается."""
+
+    world = WorldState()
+    first = world.add(velocity=Vector(1, 0))
+    second = world.add(velocity=Vector(0, 1))
+
+    world.remove(first)
+    world.move_all()
+
+    assert len(world) == 1
+    assert not world.is_alive(first)
+    assert list(world.ids()) == [second]
+    with pytest.raises(KeyError):
+        world.view(first)
+
+    third = world.add(position=Vector(7, 7))
+
+    assert third == first
+    assert world.capacity == 2
+    assert world.view(third).get_position() == Vector(7, 7)
+    assert world.view(third).get_velocity() == Vector(0, 0)